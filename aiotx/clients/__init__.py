@@ -2,7 +2,9 @@ import json
 
 import pkg_resources
 
+from ._codec import JsonCodec
 from ._evm_base_client import AioTxEVMClient
+from ._retry import RetryBudget, RetryPolicy
 from ._ton_base_client import AioTxTONClient
 from ._tron_base_client import AioTxTRONClient
 from ._utxo_base_client import AioTxUTXOClient
@@ -15,12 +17,15 @@ __all__ = [
     "AioTxBTCClient",
     "AioTxLTCClient",
     "AioTxTRONClient",
+    "JsonCodec",
+    "RetryBudget",
+    "RetryPolicy",
 ]
 
 
 class AioTxBSCClient(AioTxEVMClient):
-    def __init__(self, node_url: str, headers: dict = {}):
-        super().__init__(node_url, headers)
+    def __init__(self, node_url: str, headers: dict = {}, **kwargs):
+        super().__init__(node_url, headers, **kwargs)
         bep20_abi_json = pkg_resources.resource_string("aiotx.utils", "bep20_abi.json")
         self._bep20_abi = json.loads(bep20_abi_json)
 
@@ -29,8 +34,8 @@ class AioTxBSCClient(AioTxEVMClient):
 
 
 class AioTxETHClient(AioTxEVMClient):
-    def __init__(self, node_url: str, headers: dict = {}):
-        super().__init__(node_url, headers)
+    def __init__(self, node_url: str, headers: dict = {}, **kwargs):
+        super().__init__(node_url, headers, **kwargs)
         erc20_abi_json = pkg_resources.resource_string("aiotx.utils", "erc20_abi.json")
         self._erc20_abi = json.loads(erc20_abi_json)
 
@@ -39,8 +44,8 @@ class AioTxETHClient(AioTxEVMClient):
 
 
 class AioTxPolygonClient(AioTxEVMClient):
-    def __init__(self, node_url: str, headers: dict = {}):
-        super().__init__(node_url, headers)
+    def __init__(self, node_url: str, headers: dict = {}, **kwargs):
+        super().__init__(node_url, headers, **kwargs)
         erc20_abi_json = pkg_resources.resource_string("aiotx.utils", "erc20_abi.json")
         self._erc20_abi = json.loads(erc20_abi_json)
 
@@ -57,6 +62,7 @@ class AioTxBTCClient(AioTxUTXOClient):
         node_username: str = "",
         node_password: str = "",
         db_url="sqlite+aiosqlite:///aiotx_utxo.sqlite",
+        **kwargs,
     ):
         network_name = "testnet" if testnet else "bitcoin"
         super().__init__(
@@ -67,6 +73,7 @@ class AioTxBTCClient(AioTxUTXOClient):
             node_password,
             network_name,
             db_url,
+            **kwargs,
         )
 
 
@@ -79,6 +86,7 @@ class AioTxLTCClient(AioTxUTXOClient):
         node_username: str = "",
         node_password: str = "",
         db_url="sqlite+aiosqlite:///aiotx_utxo.sqlite",
+        **kwargs,
     ):
         network_name = "litecoin_testnet" if testnet else "litecoin"
         super().__init__(
@@ -89,4 +97,5 @@ class AioTxLTCClient(AioTxUTXOClient):
             node_password,
             network_name,
             db_url,
+            **kwargs,
         )
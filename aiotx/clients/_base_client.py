@@ -1,12 +1,33 @@
 import asyncio
+import itertools
 import os
 import signal
+import time
+from collections import deque
 from contextlib import suppress
-from typing import List, Optional
+from typing import Any, AsyncIterator, Awaitable, Callable, List, Optional, Union
 
 import aiohttp
 
-from aiotx.exceptions import BlockNotFoundError, RpcConnectionError
+from aiotx.clients._batching import RpcBatch, RpcBatcher, _active_batch
+from aiotx.clients._codec import JsonCodec, get_codec
+from aiotx.clients._dispatch import (
+    ORDERING_ADDRESS,
+    ORDERING_BLOCK,
+    ORDERINGS,
+    HandlerDispatcher,
+)
+from aiotx.clients._node_pool import (
+    CIRCUIT_CLOSED,
+    FAILOVER_STATUSES,
+    NODE_FAILURE_STATUSES,
+    CircuitStateCallback,
+    NodeEndpoint,
+    NodePool,
+)
+from aiotx.clients._rate_limit import TokenBucket, parse_retry_after
+from aiotx.clients._retry import RetryPolicy
+from aiotx.exceptions import CircuitOpenError, RateLimitExceededError
 from aiotx.log import logger
 
 
@@ -17,9 +38,74 @@ class NotConnectedError(Exception):
 
 
 class AioTxClient:
-    def __init__(self, node_url: str, headers: dict = {}):
-        self.node_url = node_url
+    # Read-only RPC methods which can be sent to two nodes at once
+    _hedged_rpc_methods: frozenset[str] = frozenset()
+
+    def __init__(
+        self,
+        node_url: Union[str, list[str]],
+        headers: dict = {},
+        node_max_failures: int = 3,
+        node_recovery_time: float = 30,
+        on_circuit_state_change: Optional[CircuitStateCallback] = None,
+        hedge_requests: bool = False,
+        hedge_percentile: float = 0.95,
+        hedge_min_delay: float = 0.05,
+        requests_per_second: Optional[float] = None,
+        rate_limit_burst: Optional[int] = None,
+        max_concurrent_requests: Optional[int] = None,
+        connection_pool_size: int = 100,
+        connection_limit_per_host: int = 0,
+        keepalive_timeout: float = 15,
+        dns_cache_ttl: Optional[int] = 10,
+        total_timeout: Optional[float] = 300,
+        connect_timeout: Optional[float] = 30,
+        read_timeout: Optional[float] = None,
+        http_compression: bool = True,
+        json_codec: Union[str, JsonCodec] = "json",
+        batch_max_size: Optional[int] = None,
+        batch_window: float = 0.01,
+    ):
+        self.node_urls = [node_url] if isinstance(node_url, str) else list(node_url)
+        # Requests are built with the first url, _make_request routes them
+        # to the best node from the pool
+        self._node_pool = NodePool(
+            self.node_urls,
+            node_max_failures,
+            node_recovery_time,
+            on_circuit_state_change,
+        )
+        self.node_url = self.node_urls[0]
+        self._hedge_requests = hedge_requests
+        self._hedge_percentile = hedge_percentile
+        self._hedge_min_delay = hedge_min_delay
+        # Every node has its own quota, so each url gets its own bucket
+        self._rate_limiters: dict[str, TokenBucket] = {}
+        if requests_per_second is not None:
+            self._rate_limiters = {
+                url: TokenBucket(requests_per_second, rate_limit_burst)
+                for url in self.node_urls
+            }
+        self._request_semaphore: Optional[asyncio.Semaphore] = None
+        if max_concurrent_requests is not None:
+            self._request_semaphore = asyncio.Semaphore(max_concurrent_requests)
         self._headers = headers
+        self._connection_pool_size = connection_pool_size
+        self._connection_limit_per_host = connection_limit_per_host
+        self._keepalive_timeout = keepalive_timeout
+        self._dns_cache_ttl = dns_cache_ttl
+        self._timeout = aiohttp.ClientTimeout(
+            total=total_timeout, sock_connect=connect_timeout, sock_read=read_timeout
+        )
+        self._http_compression = http_compression
+        self._codec = get_codec(json_codec)
+        self._rpc_batcher: Optional[RpcBatcher] = None
+        if batch_max_size is not None and batch_max_size > 1:
+            # Concurrent RPC calls made within batch_window seconds (or up to
+            # batch_max_size of them) are sent to the node as one batch request
+            self._rpc_batcher = RpcBatcher(
+                self._post_rpc, max_size=batch_max_size, window=batch_window
+            )
         self.monitor: Optional[BlockMonitor] = None
         self._stop_signal: Optional[asyncio.Event] = None
         self._stopped_signal: Optional[asyncio.Event] = None
@@ -30,7 +116,7 @@ class AioTxClient:
     async def connect(self) -> None:
         """Establish connection and create session."""
         if not self._connected:
-            self._session = aiohttp.ClientSession()
+            self._session = self._create_session()
             self._connected = True
 
     async def disconnect(self) -> None:
@@ -40,6 +126,24 @@ class AioTxClient:
             self._session = None
             self._connected = False
 
+    def _create_session(self) -> aiohttp.ClientSession:
+        connector = aiohttp.TCPConnector(
+            limit=self._connection_pool_size,
+            limit_per_host=self._connection_limit_per_host,
+            keepalive_timeout=self._keepalive_timeout,
+            use_dns_cache=self._dns_cache_ttl is not None,
+            ttl_dns_cache=self._dns_cache_ttl,
+        )
+        session_kwargs = {"connector": connector, "timeout": self._timeout}
+        if not self._http_compression:
+            session_kwargs["headers"] = {"Accept-Encoding": "identity"}
+        session_kwargs.update(self._session_kwargs())
+        return aiohttp.ClientSession(**session_kwargs)
+
+    def _session_kwargs(self) -> dict:
+        # Redefine that in client to add session wide settings (auth, etc.)
+        return {}
+
     def _check_connection(self) -> None:
         """Check if client is connected before making requests."""
         if not self._connected or not self._session:
@@ -79,6 +183,23 @@ class AioTxClient:
             self.monitor.max_retries = kwargs["max_retries"]
         if "retry_delay" in kwargs:
             self.monitor.retry_delay = kwargs["retry_delay"]
+        if "retry_policy" in kwargs:
+            self.monitor.retry_policy = kwargs["retry_policy"]
+        if "prefetch_window" in kwargs:
+            self.monitor.prefetch_window = kwargs["prefetch_window"]
+        if "handler_concurrency" in kwargs:
+            self.monitor.handler_concurrency = kwargs["handler_concurrency"]
+        if "handler_queue_size" in kwargs:
+            self.monitor.handler_queue_size = kwargs["handler_queue_size"]
+        if "handler_ordering" in kwargs:
+            if kwargs["handler_ordering"] not in ORDERINGS:
+                raise ValueError(
+                    f"Unknown handler ordering: {kwargs['handler_ordering']}. "
+                    f"Valid orderings are: {', '.join(ORDERINGS)}"
+                )
+            self.monitor.handler_ordering = kwargs["handler_ordering"]
+        if "lazy_input_decoding" in kwargs:
+            self.monitor.lazy_input_decoding = kwargs["lazy_input_decoding"]
 
         async with self._running_lock:
             if self._stop_signal is None:
@@ -134,14 +255,253 @@ class AioTxClient:
             await self._stopped_signal.wait()
 
     async def _make_request(
-        self, method: str, url: str, **kwargs
+        self, method: str, url: str, hedge: bool = False, **kwargs
     ) -> aiohttp.ClientResponse:
-        """Make HTTP request using the shared session."""
+        """Make HTTP request using the shared session.
+
+        Requests to the node are sent to the fastest node of the pool, if the
+        node fails they are sent to the next one. With hedge=True the request
+        can be sent to two nodes at once, so use it only for reads.
+
+        Raises RateLimitExceededError if the node answered with 429 status and
+        CircuitOpenError if circuits of all nodes are open.
+        """
         self._check_connection()
-        return await self._session.request(method, url, **kwargs)
+        if not url.startswith(self.node_url):
+            response = await self._send_request(method, url, **kwargs)
+        else:
+            path = url[len(self.node_url) :]
+            candidates = self._node_pool.candidates()
+            if not candidates:
+                raise CircuitOpenError(
+                    "Circuits of all nodes are open",
+                    retry_after=self._node_pool.retry_after(),
+                )
+            if (
+                hedge
+                and self._hedge_requests
+                and len(candidates) > 1
+                and candidates[1].state == CIRCUIT_CLOSED
+            ):
+                response = await self._make_hedged_request(
+                    method, path, candidates, **kwargs
+                )
+            else:
+                response = await self._make_failover_request(
+                    method, path, candidates, **kwargs
+                )
+
+        if response.status == 429:
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            response.release()
+            raise RateLimitExceededError(
+                f"Node {response.url} rate limit exceeded", retry_after=retry_after
+            )
+        return response
+
+    async def _send_request(
+        self,
+        method: str,
+        url: str,
+        rate_limiter: Optional[TokenBucket] = None,
+        **kwargs,
+    ) -> aiohttp.ClientResponse:
+        # Wait for the rate limit first, so waiting requests don't hold
+        # in-flight slots
+        if rate_limiter is not None:
+            await rate_limiter.acquire()
+        if self._request_semaphore is None:
+            return await self._session.request(method, url, **kwargs)
+        async with self._request_semaphore:
+            response = await self._session.request(method, url, **kwargs)
+            # Keep the slot until the body is read too, aiohttp caches it, so
+            # callers reading the response later get it without waiting
+            await response.read()
+            return response
+
+    async def _make_failover_request(
+        self, method: str, path: str, candidates: list[NodeEndpoint], **kwargs
+    ) -> aiohttp.ClientResponse:
+        for attempt, endpoint in enumerate(candidates, start=1):
+            is_last_attempt = attempt == len(candidates)
+            try:
+                response = await self._request_endpoint(
+                    endpoint, method, path, **kwargs
+                )
+            except (
+                aiohttp.ClientError,
+                asyncio.TimeoutError,
+                CircuitOpenError,
+            ) as e:
+                if is_last_attempt:
+                    raise
+                logger.warning(f"Node {endpoint.url} request failed: {e!r}")
+                continue
+
+            if response.status in FAILOVER_STATUSES and not is_last_attempt:
+                logger.warning(f"Node {endpoint.url} response status {response.status}")
+                response.release()
+                continue
+            return response
+
+    async def _make_hedged_request(
+        self, method: str, path: str, candidates: list[NodeEndpoint], **kwargs
+    ) -> aiohttp.ClientResponse:
+        """Send the request to the best node, and to the second best one too
+        if there is no answer after the usual (percentile) latency of the pool.
+        The first good answer wins."""
+        delay = max(
+            self._hedge_min_delay,
+            self._node_pool.latency_percentile(self._hedge_percentile) or 0,
+        )
+        tasks = [
+            asyncio.ensure_future(
+                self._request_endpoint(candidates[0], method, path, **kwargs)
+            )
+        ]
+        winner = last_done = None
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if not done:
+                logger.info(f"Hedging request to {candidates[1].url} after {delay}s")
+                tasks.append(
+                    asyncio.ensure_future(
+                        self._request_endpoint(candidates[1], method, path, **kwargs)
+                    )
+                )
+            pending = set(tasks)
+            while pending and winner is None:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    last_done = task
+                    if (
+                        task.exception() is None
+                        and task.result().status not in FAILOVER_STATUSES
+                    ):
+                        winner = task
+                        break
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+
+        remaining = candidates[len(tasks) :]
+        keep = winner or (last_done if not remaining else None)
+        for task in tasks:
+            if task is keep:
+                continue
+            if not task.done():
+                task.cancel()
+            elif task.exception() is None:
+                task.result().release()
+
+        if winner is not None:
+            return winner.result()
+        if remaining:
+            return await self._make_failover_request(method, path, remaining, **kwargs)
+        return last_done.result()
+
+    async def _request_endpoint(
+        self, endpoint: NodeEndpoint, method: str, path: str, **kwargs
+    ) -> aiohttp.ClientResponse:
+        # Another request can take the half-open probe since candidates were
+        # chosen
+        if not endpoint.acquire():
+            raise CircuitOpenError(f"Circuit of node {endpoint.url} is open")
+        rate_limiter = self._rate_limiters.get(endpoint.url)
+        started_at = time.monotonic()
+        try:
+            response = await self._send_request(
+                method, endpoint.url + path, rate_limiter, **kwargs
+            )
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            self._node_pool.record_failure(endpoint)
+            raise
+        except BaseException:
+            # Cancelled (hedging) or unexpected error, that's not node's fault
+            endpoint.release()
+            raise
+        if response.status == 429:
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            if retry_after is not None and rate_limiter is not None:
+                rate_limiter.pause(retry_after)
+            # The node is fine, it only asks to slow down
+            endpoint.release()
+        elif response.status in NODE_FAILURE_STATUSES:
+            self._node_pool.record_failure(endpoint)
+        else:
+            self._node_pool.record_success(endpoint, time.monotonic() - started_at)
+        return response
+
+    def _encode_json(self, payload: Any, headers: dict) -> dict:
+        """Request kwargs with the payload encoded by the client codec."""
+        data = self._codec.dumps(payload)
+        if isinstance(data, bytes) and "Content-Type" not in headers:
+            # aiohttp sends bytes as application/octet-stream otherwise
+            headers = {**headers, "Content-Type": "application/json"}
+        return {"data": data, "headers": headers}
+
+    def _decode_json(self, body: bytes) -> Any:
+        return self._codec.loads(body)
+
+    def _can_hedge(self, payload: Union[dict, list]) -> bool:
+        return (
+            isinstance(payload, dict)
+            and payload.get("method") in self._hedged_rpc_methods
+        )
+
+    def batch(self) -> RpcBatch:
+        """Create an explicit batch of calls.
+
+        Calls made through the batch return futures. All their RPC calls are
+        sent in one JSON-RPC batch request when the block exits::
+
+            async with client.batch() as b:
+                balance = b.get_balance(address)
+                receipt = b.get_transaction_receipt(tx_hash)
+            print(balance.result(), receipt.result())
+        """
+        return RpcBatch(self)
+
+    def _get_rpc_batcher(self) -> Optional[Union[RpcBatch, RpcBatcher]]:
+        batch = _active_batch.get()
+        if batch is not None and batch.client is self and not batch.closed:
+            return batch
+        return self._rpc_batcher
+
+    async def _send_rpc_payload(self, payload: dict, request_id) -> dict:
+        """Send a JSON-RPC payload and return the raw response object.
+
+        When batching is enabled the payload is coalesced with other concurrent
+        calls and gets a unique id, otherwise it is sent alone with request_id.
+        """
+        batcher = self._get_rpc_batcher()
+        if batcher is not None:
+            return await batcher.call(payload)
+        payload["id"] = request_id
+        return await self._post_rpc(payload)
+
+    async def _post_rpc(self, payload: Union[dict, list]) -> Union[dict, list]:
+        # This method should be implemented by clients with JSON-RPC support
+        raise NotImplementedError("_post_rpc method must be implemented by subclasses")
 
 
 class BlockMonitor:
+    # Created on first use, monitors don't always call BlockMonitor.__init__
+    _retry_policy: Optional[RetryPolicy] = None
+    # How many blocks are fetched ahead of the processed one while catching up
+    prefetch_window: int = 1
+    # How many handler calls run concurrently, 1 calls handlers one by one
+    handler_concurrency: int = 1
+    # How many handler calls can wait for a worker before the monitor waits
+    handler_queue_size: int = 100
+    # "block": all handler calls of a block are done before the next block
+    # "address": calls of one address run in order, blocks don't wait
+    handler_ordering: str = ORDERING_BLOCK
+    _dispatcher: Optional[HandlerDispatcher] = None
+
     def __init__(self, client: AioTxClient):
         self.client = client
         self.block_handlers: List[callable] = []
@@ -150,8 +510,34 @@ class BlockMonitor:
         self.block_transactions_handlers: List[callable] = []
         self._stop_signal: Optional[asyncio.Event] = None
         self._latest_block: Optional[int] = None
-        self.max_retries: Optional[int] = 10
-        self.retry_delay: Optional[float] = 0.2
+        self.max_retries = 10
+        self.retry_delay = 0.2
+
+    @property
+    def retry_policy(self) -> RetryPolicy:
+        if self._retry_policy is None:
+            self._retry_policy = RetryPolicy()
+        return self._retry_policy
+
+    @retry_policy.setter
+    def retry_policy(self, policy: RetryPolicy) -> None:
+        self._retry_policy = policy
+
+    @property
+    def max_retries(self) -> int:
+        return self.retry_policy.max_retries
+
+    @max_retries.setter
+    def max_retries(self, value: int) -> None:
+        self.retry_policy.max_retries = value
+
+    @property
+    def retry_delay(self) -> float:
+        return self.retry_policy.base_delay
+
+    @retry_delay.setter
+    def retry_delay(self, value: float) -> None:
+        self.retry_policy.base_delay = value
 
     def on_block(self, func):
         self.block_handlers.append(func)
@@ -169,20 +555,75 @@ class BlockMonitor:
         self.new_utxo_transaction_handlers.append(func)
         return func
 
+    async def _call_handler(
+        self, handler: Callable[..., Awaitable[Any]], *args, address=None
+    ) -> None:
+        """Call the handler now, or queue it when handlers run concurrently.
+
+        With "address" ordering calls of the same ``address`` run in order,
+        calls without one (block handlers, etc.) run in order too.
+        """
+        if self.handler_concurrency <= 1:
+            await handler(*args)
+            return
+        if self._dispatcher is None:
+            self._dispatcher = HandlerDispatcher(
+                self.handler_concurrency, self.handler_queue_size
+            )
+        key = None
+        if self.handler_ordering == ORDERING_ADDRESS:
+            key = "" if address is None else address
+        await self._dispatcher.submit(key, handler, *args)
+
+    async def _end_block(self) -> None:
+        """Wait for handler calls of the block with "block" ordering."""
+        if self._dispatcher is not None and self.handler_ordering == ORDERING_BLOCK:
+            await self._dispatcher.join()
+
+    async def _close_dispatcher(self, wait: bool) -> None:
+        if self._dispatcher is None:
+            return
+        dispatcher, self._dispatcher = self._dispatcher, None
+        try:
+            if wait:
+                await dispatcher.join()
+        finally:
+            await dispatcher.close()
+
     async def _make_request_with_retry(self, request_func, *args, **kwargs):
-        """Make a request with retry logic."""
-        for attempt in range(self.max_retries):
-            try:
-                return await request_func(*args, **kwargs)
-            except (RpcConnectionError, BlockNotFoundError) as e:
-                if attempt < self.max_retries - 1:
-                    delay = self.retry_delay * (2**attempt)
-                    logger.warning(
-                        f"RpcConnectionError {e}, retrying in {delay} seconds... (Attempt {attempt + 1}/{self.max_retries})"
-                    )
-                    await asyncio.sleep(delay)
-                else:
-                    raise
+        """Make a request with retry logic of the monitor retry policy."""
+        return await self.retry_policy.call(request_func, *args, **kwargs)
+
+    async def _fetch_blocks_in_order(
+        self,
+        fetch_block: Callable[[int], Awaitable[Any]],
+        block_numbers: range,
+        window: int,
+    ) -> AsyncIterator[tuple[int, Any]]:
+        """Yield (block number, block) in order, keeping up to ``window``
+        fetches in flight ahead of the block which is being processed."""
+        numbers = iter(block_numbers)
+        pending: deque[tuple[int, asyncio.Future]] = deque()
+
+        def schedule():
+            for number in itertools.islice(numbers, window - len(pending)):
+                task = asyncio.ensure_future(
+                    self._make_request_with_retry(fetch_block, number)
+                )
+                pending.append((number, task))
+
+        try:
+            schedule()
+            while pending:
+                number, task = pending.popleft()
+                block = await task
+                # Next fetches run while handlers process this block
+                schedule()
+                yield number, block
+        finally:
+            for _, task in pending:
+                task.cancel()
+            await asyncio.gather(*[task for _, task in pending], return_exceptions=True)
 
     async def start(
         self,
@@ -193,19 +634,28 @@ class BlockMonitor:
         self._stop_signal = asyncio.Event()
         self._latest_block = monitoring_start_block
 
-        while not self._stop_signal.is_set():
-            try:
-                await self.poll_blocks(timeout_between_blocks)
-                await asyncio.sleep(timeout_between_blocks)
-            except asyncio.CancelledError:
-                break
-            except Exception as e:
-                print(f"Error during block monitoring: {e}")
-                self._stop_signal.set()
-                raise
-
-    async def poll_blocks(self, timeout: int, **kwargs):
-        # This method should be implemented by subclasses
+        failed = False
+        try:
+            while not self._stop_signal.is_set():
+                try:
+                    behind = await self.poll_blocks(timeout_between_blocks)
+                    # Monitors catching up with the network poll again right away
+                    if not behind:
+                        await asyncio.sleep(timeout_between_blocks)
+                except asyncio.CancelledError:
+                    break
+                except Exception as e:
+                    print(f"Error during block monitoring: {e}")
+                    self._stop_signal.set()
+                    failed = True
+                    raise
+        finally:
+            # Handler calls which are already queued are done before stop
+            await self._close_dispatcher(wait=not failed)
+
+    async def poll_blocks(self, timeout: int, **kwargs) -> Optional[bool]:
+        # This method should be implemented by subclasses, it returns True
+        # when the monitor is behind the network and should poll again
         raise NotImplementedError(
             "poll_blocks method must be implemented by subclasses"
         )
@@ -0,0 +1,158 @@
+import asyncio
+import inspect
+import itertools
+from contextvars import ContextVar
+from typing import Awaitable, Callable, Optional
+
+from aiotx.exceptions import RpcConnectionError
+
+_request_ids = itertools.count(1)
+
+
+class RpcBatcher:
+    """Collects JSON-RPC calls and sends them to the node as one batch request.
+
+    Queued calls are flushed when ``max_size`` calls are waiting or ``window``
+    seconds after the first call was queued, whichever happens first. Every call
+    gets a unique id and resolves with its own response object from the batch.
+    """
+
+    def __init__(
+        self,
+        send_batch: Callable[[list[dict]], Awaitable[list[dict]]],
+        max_size: Optional[int] = None,
+        window: Optional[float] = None,
+    ):
+        self._send_batch = send_batch
+        self.max_size = max_size
+        self.window = window
+        self._queue: list[tuple[dict, asyncio.Future]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._flush_tasks: set[asyncio.Task] = set()
+
+    async def call(self, payload: dict) -> dict:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        payload["id"] = next(_request_ids)
+        self._queue.append((payload, future))
+
+        if self.max_size is not None and len(self._queue) >= self.max_size:
+            self._start_flush()
+        elif self._flush_handle is None and self.window is not None:
+            self._flush_handle = loop.call_later(self.window, self._start_flush)
+        return await future
+
+    def _start_flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if not self._queue:
+            return
+        calls, self._queue = self._queue, []
+        task = asyncio.ensure_future(self._send(calls))
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._flush_tasks.discard)
+
+    async def flush(self) -> None:
+        """Send every queued call right away and wait until the batch is answered."""
+        self._start_flush()
+        if self._flush_tasks:
+            await asyncio.gather(*self._flush_tasks)
+
+    async def _send(self, calls: list[tuple[dict, asyncio.Future]]) -> None:
+        try:
+            responses = await self._send_batch([payload for payload, _ in calls])
+            if not isinstance(responses, list):
+                # Nodes without batch support answer with a single error object
+                raise RpcConnectionError(f"Unexpected batch response: {responses}")
+        except asyncio.CancelledError:
+            for _, future in calls:
+                future.cancel()
+            raise
+        except Exception as e:
+            for _, future in calls:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        responses_by_id = {response.get("id"): response for response in responses}
+        for payload, future in calls:
+            if future.done():
+                continue
+            response = responses_by_id.get(payload["id"])
+            if response is None:
+                future.set_exception(
+                    RpcConnectionError(f"No response for batch call id {payload['id']}")
+                )
+            else:
+                future.set_result(response)
+
+
+_active_batch: ContextVar[Optional["RpcBatch"]] = ContextVar(
+    "aiotx_active_batch", default=None
+)
+
+
+class RpcBatch:
+    """Explicit batch of client calls, created by ``AioTxClient.batch()``.
+
+    Client methods called on the batch are started right away and return
+    futures. Their RPC calls are queued and sent in one JSON-RPC batch request
+    ``window`` seconds after the ``async with`` block exits (or once all the
+    methods are done), which also resolves the futures.
+    """
+
+    # How long methods can take to make their RPC calls after the block exits
+    window: float = 0.01
+
+    def __init__(self, client):
+        self.client = client
+        self.closed = False
+        self._batcher = RpcBatcher(client._post_rpc)
+        self._tasks: list[asyncio.Task] = []
+
+    def __getattr__(self, name: str):
+        method = getattr(self.client, name)
+        if not inspect.iscoroutinefunction(method):
+            raise AttributeError(f"{name} can't be called in a batch")
+
+        def queue_call(*args, **kwargs) -> asyncio.Future:
+            if self.closed:
+                raise RuntimeError("Batch is already executed")
+            task = asyncio.ensure_future(self._run(method(*args, **kwargs)))
+            self._tasks.append(task)
+            return task
+
+        return queue_call
+
+    async def _run(self, coro):
+        # Task has its own copy of the context, so other calls are not affected
+        _active_batch.set(self)
+        return await coro
+
+    async def call(self, payload: dict) -> dict:
+        return await self._batcher.call(payload)
+
+    async def execute(self) -> None:
+        # Methods can await something else before their RPC call (fan out,
+        # database), so give them the window instead of guessing when all
+        # of them are queued
+        if self._tasks:
+            await asyncio.wait(self._tasks, timeout=self.window)
+        # Calls made after the batch was sent (for example the second call of
+        # a method which needs two of them) are sent without batching
+        self.closed = True
+        await self._batcher.flush()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            await self.execute()
+            return
+        self.closed = True
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
@@ -0,0 +1,80 @@
+import json
+from typing import Any, Union
+
+
+class JsonCodec:
+    """Encodes request payloads and decodes response bodies.
+
+    The default one uses the standard ``json`` module, so requests are
+    byte-to-byte the same as before codecs were added.
+    """
+
+    name = "json"
+
+    def dumps(self, obj: Any) -> Union[str, bytes]:
+        return json.dumps(obj)
+
+    def loads(self, data: bytes) -> Any:
+        return json.loads(data)
+
+
+class OrjsonCodec(JsonCodec):
+    name = "orjson"
+
+    def __init__(self):
+        try:
+            import orjson
+        except ImportError:
+            raise ImportError(
+                "orjson is required for the orjson codec, install it with: "
+                "pip install aiotx[orjson]"
+            )
+        self._orjson = orjson
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._orjson.dumps(obj)
+
+    def loads(self, data: bytes) -> Any:
+        return self._orjson.loads(data)
+
+
+class MsgspecCodec(JsonCodec):
+    name = "msgspec"
+
+    def __init__(self):
+        try:
+            import msgspec
+        except ImportError:
+            raise ImportError(
+                "msgspec is required for the msgspec codec, install it with: "
+                "pip install msgspec"
+            )
+        self._encoder = msgspec.json.Encoder()
+        self._decoder = msgspec.json.Decoder()
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._encoder.encode(obj)
+
+    def loads(self, data: bytes) -> Any:
+        return self._decoder.decode(data)
+
+
+CODECS = {codec.name: codec for codec in (JsonCodec, OrjsonCodec, MsgspecCodec)}
+
+
+def get_codec(codec: Union[str, JsonCodec]) -> JsonCodec:
+    """Codec instance by name, "auto" picks the fastest installed one."""
+    if isinstance(codec, JsonCodec):
+        return codec
+    if codec == "auto":
+        for codec_class in (OrjsonCodec, MsgspecCodec):
+            try:
+                return codec_class()
+            except ImportError:
+                continue
+        return JsonCodec()
+    if codec not in CODECS:
+        raise ValueError(
+            f"Unknown json codec: {codec}. Valid codecs are: auto, {', '.join(CODECS)}"
+        )
+    return CODECS[codec]()
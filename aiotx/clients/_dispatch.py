@@ -0,0 +1,78 @@
+import asyncio
+import zlib
+from typing import Any, Awaitable, Callable, Hashable, Optional
+
+ORDERING_BLOCK = "block"
+ORDERING_ADDRESS = "address"
+ORDERINGS = (ORDERING_BLOCK, ORDERING_ADDRESS)
+
+
+class HandlerDispatcher:
+    """Runs handler calls on ``concurrency`` workers.
+
+    Every worker has its own queue of up to ``queue_size`` calls. Calls with
+    the same key go to the same worker, so they run in the order they were
+    submitted, calls without a key are spread over all workers. ``submit``
+    waits while the queue is full, so a slow handler pauses the monitor
+    instead of queued calls growing without limit.
+
+    The first handler error is raised by the next ``submit`` or ``join``,
+    calls queued after it are dropped.
+    """
+
+    def __init__(self, concurrency: int, queue_size: int):
+        if concurrency < 1:
+            raise ValueError("Concurrency must be positive")
+        self._queues = [asyncio.Queue(maxsize=queue_size) for _ in range(concurrency)]
+        self._workers: list[asyncio.Task] = []
+        self._next_queue = 0
+        self._error: Optional[BaseException] = None
+
+    async def submit(
+        self,
+        key: Optional[Hashable],
+        handler: Callable[..., Awaitable[Any]],
+        *args,
+    ) -> None:
+        self._raise_error()
+        if not self._workers:
+            self._workers = [
+                asyncio.create_task(self._work(queue)) for queue in self._queues
+            ]
+        if key is None:
+            queue = self._queues[self._next_queue]
+            self._next_queue = (self._next_queue + 1) % len(self._queues)
+        else:
+            # hash() of strings changes from process to process, crc32 keeps
+            # the key to worker mapping stable
+            index = zlib.crc32(str(key).encode()) % len(self._queues)
+            queue = self._queues[index]
+        await queue.put((handler, args))
+
+    async def join(self) -> None:
+        """Wait until all submitted calls are done."""
+        for queue in self._queues:
+            await queue.join()
+        self._raise_error()
+
+    async def close(self) -> None:
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    async def _work(self, queue: asyncio.Queue) -> None:
+        while True:
+            handler, args = await queue.get()
+            try:
+                if self._error is None:
+                    await handler(*args)
+            except Exception as e:
+                self._error = e
+            finally:
+                queue.task_done()
+
+    def _raise_error(self) -> None:
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
@@ -1,9 +1,9 @@
 import binascii
 import decimal
-import json
 import secrets
 import sys
-from typing import Union
+from contextlib import aclosing
+from typing import Callable, Optional, Union
 
 from aiotx.clients._base_client import AioTxClient, BlockMonitor
 from aiotx.exceptions import (
@@ -28,12 +28,21 @@ from aiotx.exceptions import (
     VMExecutionError,
     WrongPrivateKey,
 )
-from aiotx.log import logger
+from aiotx.log import LazyPayload, logger, payload_method, should_log_payload
 from aiotx.types import BlockParam
 
+DECODED_INPUT_KEY = "aiotx_decoded_input"
+# keccak("Transfer(address,address,uint256)")
+TRANSFER_EVENT_TOPIC = (
+    "0xddf252ad1be2c89b69c2b068fc378daa952ba7f163c4a11628f55a4df523b3ef"
+)
+
 
 class AioTxEVMBaseClient(AioTxClient):
-    def __init__(self, node_url: str, headers: dict):
+    _hedged_rpc_methods = frozenset({"eth_getBlockByNumber", "eth_getBalance"})
+    _selector_decoders: Optional[dict] = None
+
+    def __init__(self, node_url: str, headers: dict, **kwargs):
         try:
             import eth_abi  # noqa: F401
             import eth_account  # noqa: F401
@@ -46,7 +55,7 @@ class AioTxEVMBaseClient(AioTxClient):
             )
             sys.exit(-1)
 
-        super().__init__(node_url, headers)
+        super().__init__(node_url, headers, **kwargs)
         self.chain_id = None
         self.monitor = EvmMonitor(self)
         self._monitoring_task = None
@@ -62,60 +71,75 @@ class AioTxEVMBaseClient(AioTxClient):
         # Redefine that in you client
         return []
 
+    def _get_selector_decoders(self) -> dict:
+        """ABI entries by the 4-byte selector hex, built once per client."""
+        if self._selector_decoders is None:
+            from eth_utils import function_signature_to_4byte_selector
+
+            selector_decoders = {}
+            for abi_entry in self._get_abi_entries():
+                function_name = abi_entry.get("name")
+                if function_name is None:
+                    continue
+                input_types = tuple(inp["type"] for inp in abi_entry["inputs"])
+                function_signature = f"{function_name}({','.join(input_types)})"
+                selector = function_signature_to_4byte_selector(function_signature)
+                # The first entry wins, like it did when the ABI was searched
+                selector_decoders.setdefault(
+                    selector.hex(),
+                    (
+                        function_name,
+                        function_signature,
+                        input_types,
+                        tuple(inp["name"] for inp in abi_entry["inputs"]),
+                    ),
+                )
+            self._selector_decoders = selector_decoders
+        return self._selector_decoders
+
     def decode_transaction_input(self, input_data: str) -> dict:
         from eth_abi import decode
         from eth_abi.exceptions import InsufficientDataBytes, NonEmptyPaddingBytes
-        from eth_utils import decode_hex, function_signature_to_4byte_selector
+        from eth_utils import decode_hex
 
         if input_data == "0x":
             return {"function_name": None, "parameters": None}
         if not input_data.startswith("0x"):
             input_data = "0x" + input_data
-        for abi_entry in self._get_abi_entries():
-            function_name = abi_entry.get("name")
-            if function_name is None:
-                continue
-            input_types = [inp["type"] for inp in abi_entry["inputs"]]
-            function_signature = f"{function_name}({','.join(input_types)})"
-            function_selector = function_signature_to_4byte_selector(function_signature)
-            if input_data.startswith("0x" + function_selector.hex()):
-                try:
-                    decoded_data = decode(input_types, decode_hex(input_data[10:]))
-
-                except (NonEmptyPaddingBytes, InsufficientDataBytes):
-                    # If decoding fails, try to handle potential Tron-specific format
-                    try:
-                        # For Tron, we need to handle the '41' prefix in the address
-                        address_start = 10  # Start of address (after function selector)
-                        address_end = 74  # End of address (32 bytes after start)
-                        value_start = 74  # Start of value
-
-                        address = input_data[address_start:address_end].replace(
-                            "0000000000000000000000", ""
-                        )
-                        if address.startswith("41"):
-                            address = "0x" + address[2:]  # Remove '41' and add '0x'
-                        else:
-                            address = "0x" + address
-
-                        value = int(input_data[value_start:], 16)
-
-                        decoded_data = [address, value]
-                    except Exception as e:
-                        logger.warning(
-                            f"Failed to decode input for method '{function_signature}'. Error: {str(e)}"
-                        )
-                        return {"function_name": None, "parameters": None}
-
-                decoded_params = {}
-                for i, param in enumerate(decoded_data):
-                    param_name = abi_entry["inputs"][i]["name"]
-                    param_value = param
-                    decoded_params[param_name] = param_value
-
-                return {"function_name": function_name, "parameters": decoded_params}
-
-        return {"function_name": None, "parameters": None}
+        decoder = self._get_selector_decoders().get(input_data[2:10])
+        if decoder is None:
+            return {"function_name": None, "parameters": None}
+        function_name, function_signature, input_types, param_names = decoder
+        try:
+            decoded_data = decode(input_types, decode_hex(input_data[10:]))
+
+        except (NonEmptyPaddingBytes, InsufficientDataBytes):
+            # If decoding fails, try to handle potential Tron-specific format
+            try:
+                # For Tron, we need to handle the '41' prefix in the address
+                address_start = 10  # Start of address (after function selector)
+                address_end = 74  # End of address (32 bytes after start)
+                value_start = 74  # Start of value
+
+                address = input_data[address_start:address_end].replace(
+                    "0000000000000000000000", ""
+                )
+                if address.startswith("41"):
+                    address = "0x" + address[2:]  # Remove '41' and add '0x'
+                else:
+                    address = "0x" + address
+
+                value = int(input_data[value_start:], 16)
+
+                decoded_data = [address, value]
+            except Exception as e:
+                logger.warning(
+                    f"Failed to decode input for method '{function_signature}'. Error: {str(e)}"
+                )
+                return {"function_name": None, "parameters": None}
+
+        decoded_params = dict(zip(param_names, decoded_data))
+        return {"function_name": function_name, "parameters": decoded_params}
 
     async def get_last_block_number(self) -> int:
         payload = {"method": "eth_blockNumber", "params": []}
@@ -181,7 +205,7 @@ class AioTxEVMBaseClient(AioTxClient):
         tx_data = await self._make_rpc_call(payload)
         if tx_data is None:
             raise TransactionNotFound(f"Transaction {hash} not found!")
-        tx_data["aiotx_decoded_input"] = self.decode_transaction_input(tx_data["input"])
+        tx_data[DECODED_INPUT_KEY] = self.decode_transaction_input(tx_data["input"])
         return tx_data
 
     async def get_transaction_receipt(self, hash) -> dict:
@@ -196,10 +220,49 @@ class AioTxEVMBaseClient(AioTxClient):
         tx_count = await self._make_rpc_call(payload)
         return 0 if tx_count == "0x" else int(tx_count, 16)
 
+    async def get_logs(
+        self,
+        from_block: int,
+        to_block: int,
+        address: Union[str, list[str], None] = None,
+        topics: Optional[list] = None,
+        max_block_range: int = 10_000,
+    ) -> list[dict]:
+        """Logs of the blocks range, requested by at most ``max_block_range``
+        blocks. Ranges which the node still finds too long are split in two."""
+        logs = []
+        for start in range(from_block, to_block + 1, max_block_range):
+            end = min(to_block, start + max_block_range - 1)
+            logs.extend(await self._get_logs_range(start, end, address, topics))
+        return logs
+
+    async def _get_logs_range(
+        self,
+        from_block: int,
+        to_block: int,
+        address: Union[str, list[str], None],
+        topics: Optional[list],
+    ) -> list[dict]:
+        log_filter = {"fromBlock": hex(from_block), "toBlock": hex(to_block)}
+        if address:
+            log_filter["address"] = address
+        if topics:
+            log_filter["topics"] = topics
+        payload = {"method": "eth_getLogs", "params": [log_filter]}
+        try:
+            return await self._make_rpc_call(payload)
+        except BlockRangeLimitExceededError:
+            if from_block == to_block:
+                raise
+        middle = (from_block + to_block) // 2
+        logs = await self._get_logs_range(from_block, middle, address, topics)
+        logs.extend(await self._get_logs_range(middle + 1, to_block, address, topics))
+        return logs
+
 
 class AioTxEVMClient(AioTxEVMBaseClient):
-    def __init__(self, node_url, headers):
-        super().__init__(node_url, headers)
+    def __init__(self, node_url, headers, **kwargs):
+        super().__init__(node_url, headers, **kwargs)
         self.chain_id = None
         self.monitor = EvmMonitor(self)
         self._monitoring_task = None
@@ -354,20 +417,31 @@ class AioTxEVMClient(AioTxEVMBaseClient):
     async def _make_rpc_call(self, payload) -> dict:
         self._check_connection()
         payload["jsonrpc"] = "2.0"
-        payload["id"] = 1
-        logger.info(f"rpc call payload: {payload}")
+        result = await self._send_rpc_payload(payload, 1)
+        return self._process_rpc_result(result)
+
+    async def _post_rpc(self, payload: Union[dict, list]) -> Union[dict, list]:
+        log_payload = should_log_payload(payload_method(payload))
+        if log_payload:
+            logger.info("rpc call payload: %s", LazyPayload(payload))
 
         response = await self._make_request(
-            "POST", self.node_url, data=json.dumps(payload), headers=self._headers
+            "POST",
+            self.node_url,
+            hedge=self._can_hedge(payload),
+            **self._encode_json(payload, self._headers),
         )
 
-        response_text = await response.text()
-        logger.info(f"rpc call result: {response_text}")
+        body = await response.read()
+        if log_payload:
+            logger.info("rpc call result: %s", LazyPayload(body))
 
         if response.status != 200:
-            raise RpcConnectionError(response_text)
+            raise RpcConnectionError(body.decode(errors="replace"))
+
+        return self._decode_json(body)
 
-        result = await response.json()
+    def _process_rpc_result(self, result: dict):
         if "error" not in result.keys():
             return result["result"]
 
@@ -426,14 +500,178 @@ class AioTxEVMClient(AioTxEVMBaseClient):
             raise RpcConnectionError(f"Error {error_code}: {error_message}")
 
 
-class EvmMonitor(BlockMonitor):
+class LazyDecodedTransaction(dict):
+    """Transaction which decodes ``aiotx_decoded_input`` when it's read first.
+
+    Until then the key is not in ``keys()`` or ``items()``, but item access,
+    ``get`` and ``in`` work as if it was. The result is kept in the dict.
+    """
+
+    def __init__(self, transaction: dict, decode_input: Callable[[str], dict]):
+        super().__init__(transaction)
+        self._decode_input = decode_input
+
+    def __missing__(self, key):
+        if key != DECODED_INPUT_KEY:
+            raise KeyError(key)
+        decoded_input = self[key] = self._decode_input(self["input"])
+        return decoded_input
+
+    def get(self, key, default=None):
+        if key == DECODED_INPUT_KEY:
+            return self[key]
+        return super().get(key, default)
+
+    def __contains__(self, key) -> bool:
+        return key == DECODED_INPUT_KEY or super().__contains__(key)
+
+
+def decode_transactions_input(
+    transactions: list[dict], decode_input: Callable[[str], dict], lazy: bool
+) -> None:
+    """Add decoded input to every transaction of the list, in place."""
+    for i, transaction in enumerate(transactions):
+        if lazy:
+            transactions[i] = LazyDecodedTransaction(transaction, decode_input)
+        else:
+            transaction[DECODED_INPUT_KEY] = decode_input(transaction["input"])
+
+
+def _address_topic(address: str) -> str:
+    return "0x" + address.lower().removeprefix("0x").zfill(64)
+
+
+def decode_transfer_log(log: dict) -> Optional[dict]:
+    """ERC-20 Transfer event of the log, None for other events (ERC-721
+    Transfer has the token id as the fourth topic)."""
+    topics = log["topics"]
+    if len(topics) != 3 or topics[0] != TRANSFER_EVENT_TOPIC:
+        return None
+    data = log["data"]
+    return {
+        "contract": log["address"],
+        "from": "0x" + topics[1][-40:],
+        "to": "0x" + topics[2][-40:],
+        "value": 0 if data == "0x" else int(data, 16),
+        "block_number": int(log["blockNumber"], 16),
+        "transaction_hash": log["transactionHash"],
+        "log_index": int(log["logIndex"], 16),
+        "log": log,
+    }
+
+
+# Decoded input parameters which hold the token recipient in known ABIs
+RECIPIENT_PARAMETERS = ("_to", "to", "recipient")
+# Functions with a token recipient, input of other calls is not decoded
+# just to look for one
+TRANSFER_FUNCTIONS = frozenset({"transfer", "transferFrom"})
+
+
+class AddressFilteredHandlersMixin:
+    """Transaction handlers which only get transactions of given addresses.
+
+    Addresses of all such handlers are kept in one index, so every
+    transaction is looked up once, however many handlers there are::
+
+        @client.monitor.on_transaction(addresses=my_addresses)
+        async def handle_transaction(transaction):
+            ...
+    """
+
+    def on_transaction(self, func=None, *, addresses=None):
+        def register(func):
+            if addresses is None:
+                self.transaction_handlers.append(func)
+                return func
+            position = len(self.address_transaction_handlers)
+            self.address_transaction_handlers.append(func)
+            for address in addresses:
+                self._address_handler_index.setdefault(
+                    self._normalize_address(address), []
+                ).append(position)
+            return func
+
+        return register if func is None else register(func)
+
+    def _normalize_address(self, address: str) -> str:
+        return address.lower()
+
+    def _transaction_addresses(self, transaction: dict) -> set[str]:
+        """Sender, receiver and token recipient of the transaction."""
+        addresses = {
+            self._normalize_address(address)
+            for address in (transaction.get("from"), transaction.get("to"))
+            if address
+        }
+        if self._is_transfer_input(transaction.get("input", "0x")):
+            parameters = transaction[DECODED_INPUT_KEY]["parameters"] or {}
+            for name in RECIPIENT_PARAMETERS:
+                recipient = parameters.get(name)
+                if isinstance(recipient, str):
+                    addresses.add(self._normalize_address(recipient))
+        return addresses
+
+    def _is_transfer_input(self, input_data: str) -> bool:
+        selector = input_data[2:10] if input_data.startswith("0x") else input_data[:8]
+        decoder = self.client._get_selector_decoders().get(selector)
+        return decoder is not None and decoder[0] in TRANSFER_FUNCTIONS
+
+    async def _handle_transaction(self, transaction: dict) -> None:
+        # Calls for one receiver keep their order with "address" ordering
+        address = transaction.get("to") or transaction.get("from")
+        for handler in self.transaction_handlers:
+            await self._call_handler(handler, transaction, address=address)
+        if not self._address_handler_index:
+            return
+        positions = set()
+        for watched_address in self._transaction_addresses(transaction):
+            positions.update(self._address_handler_index.get(watched_address, ()))
+        for position in sorted(positions):
+            await self._call_handler(
+                self.address_transaction_handlers[position],
+                transaction,
+                address=address,
+            )
+
+
+class EvmMonitor(AddressFilteredHandlersMixin, BlockMonitor):
+    # Decode transaction input only when a handler reads it
+    lazy_input_decoding: bool = False
+    # Max number of blocks which transfer logs are requested for at once
+    log_block_range: int = 10_000
+
     def __init__(self, client: AioTxEVMClient):
         self.client = client
         self.block_handlers = []
         self.transaction_handlers = []
         self.block_transactions_handlers = []
+        self.transfer_handlers = []
+        self.address_transaction_handlers = []
+        self._address_handler_index: dict[str, list[int]] = {}
         self.running = False
         self._latest_block = None
+        # Contracts and recipients of watched Transfer events, monitor reads
+        # logs instead of whole blocks when it's set
+        self._transfer_filter: Optional[tuple[list[str], list[str]]] = None
+
+    def on_transfer(self, func):
+        self.transfer_handlers.append(func)
+        return func
+
+    def watch_transfers(
+        self,
+        contracts: Optional[list[str]] = None,
+        recipients: Optional[list[str]] = None,
+    ) -> None:
+        """Monitor token Transfer events of the contracts and/or to the
+        recipients with eth_getLogs instead of reading whole blocks."""
+        if not contracts and not recipients:
+            # Otherwise every Transfer event of the chain would be requested
+            raise ValueError("At least one contract or recipient is required")
+        self._transfer_filter = (
+            [contract.lower() for contract in contracts or []],
+            [_address_topic(recipient) for recipient in recipients or []],
+        )
 
     async def poll_blocks(self, _: int):
         network_latest_block = await self.client.get_last_block_number()
@@ -442,22 +680,75 @@ class EvmMonitor(BlockMonitor):
         )
         if target_block > network_latest_block:
             return
+        if self._transfer_filter is not None:
+            return await self._poll_transfer_logs(target_block, network_latest_block)
+        if self.prefetch_window > 1:
+            return await self._catch_up(target_block, network_latest_block)
         cur_block = await self.client.get_block_by_number(target_block)
         await self.process_block(cur_block, network_latest_block)
         self._latest_block = target_block + 1
 
+    async def _catch_up(self, target_block: int, network_latest_block: int) -> bool:
+        blocks = self._fetch_blocks_in_order(
+            self.client.get_block_by_number,
+            range(target_block, network_latest_block + 1),
+            self.prefetch_window,
+        )
+        async with aclosing(blocks):
+            async for block_number, cur_block in blocks:
+                await self.process_block(cur_block, network_latest_block)
+                self._latest_block = block_number + 1
+        # New blocks could come while we were processing these ones
+        return True
+
     async def process_block(self, cur_block, network_latest_block):
         for handler in self.block_handlers:
             if not isinstance(network_latest_block, int):
                 network_latest_block = int(network_latest_block, 16)
-            await handler(int(cur_block["number"], 16), network_latest_block)
+            await self._call_handler(
+                handler, int(cur_block["number"], 16), network_latest_block
+            )
 
+        decode_transactions_input(
+            cur_block["transactions"],
+            self.client.decode_transaction_input,
+            self.lazy_input_decoding,
+        )
         for transaction in cur_block["transactions"]:
-            transaction["aiotx_decoded_input"] = self.client.decode_transaction_input(
-                transaction["input"]
-            )
-            for handler in self.transaction_handlers:
-                await handler(transaction)
+            await self._handle_transaction(transaction)
 
         for handler in self.block_transactions_handlers:
-            await handler(cur_block["transactions"])
+            await self._call_handler(handler, cur_block["transactions"])
+        await self._end_block()
+
+    async def _poll_transfer_logs(
+        self, target_block: int, network_latest_block: int
+    ) -> bool:
+        to_block = min(network_latest_block, target_block + self.log_block_range - 1)
+        contracts, recipients = self._transfer_filter
+        topics = [TRANSFER_EVENT_TOPIC]
+        if recipients:
+            topics += [None, recipients]
+        logs = await self.client.get_logs(
+            target_block, to_block, address=contracts or None, topics=topics
+        )
+        transfers_by_block = {}
+        for log in logs:
+            transfer = None if log.get("removed") else decode_transfer_log(log)
+            if transfer is not None:
+                transfers_by_block.setdefault(transfer["block_number"], []).append(
+                    transfer
+                )
+
+        for block_number in range(target_block, to_block + 1):
+            for handler in self.block_handlers:
+                await self._call_handler(handler, block_number, network_latest_block)
+            transfers = transfers_by_block.get(block_number, [])
+            transfers.sort(key=lambda transfer: transfer["log_index"])
+            for transfer in transfers:
+                for handler in self.transfer_handlers:
+                    await self._call_handler(handler, transfer, address=transfer["to"])
+            await self._end_block()
+            self._latest_block = block_number + 1
+        # Don't wait before the next range while behind the network
+        return to_block < network_latest_block
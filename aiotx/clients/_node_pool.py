@@ -0,0 +1,170 @@
+import time
+from collections import deque
+from typing import Callable, Optional
+
+# Weight of the newest sample in the moving averages
+SMOOTHING = 0.2
+
+# Statuses which mean the node itself has problems, other statuses are answers
+# to the request (JSON-RPC errors can come with 500 for example)
+NODE_FAILURE_STATUSES = {502, 503, 504}
+
+# Statuses after which the request is sent to the next node. 429 means the
+# node works but we send too much, so it doesn't open the node circuit
+FAILOVER_STATUSES = NODE_FAILURE_STATUSES | {429}
+
+# Number of recent latency samples used for percentiles
+LATENCY_SAMPLES = 200
+
+
+# Circuit breaker states of a node
+CIRCUIT_CLOSED = "closed"
+CIRCUIT_OPEN = "open"
+CIRCUIT_HALF_OPEN = "half_open"
+
+# Called with node url, old state and new state
+CircuitStateCallback = Callable[[str, str, str], None]
+
+
+class NodeEndpoint:
+    """Latency and error statistics of a single node url, with a circuit breaker.
+
+    The circuit opens after ``max_failures`` failures in a row, and requests
+    to the node fail fast for ``recovery_time`` seconds. Then the circuit is
+    half-open: one probe request goes to the node, if it succeeds the circuit
+    closes, otherwise it opens again.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        max_failures: int = 3,
+        recovery_time: float = 30,
+        on_state_change: Optional[CircuitStateCallback] = None,
+    ):
+        self.url = url
+        self.max_failures = max_failures
+        self.recovery_time = recovery_time
+        self.on_state_change = on_state_change
+        self.latency: Optional[float] = None
+        self.error_rate = 0.0
+        self.requests = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.state = CIRCUIT_CLOSED
+        self.opened_until = 0.0
+        self._probing = False
+
+    def _set_state(self, state: str) -> None:
+        old_state, self.state = self.state, state
+        if old_state != state and self.on_state_change is not None:
+            self.on_state_change(self.url, old_state, state)
+
+    @property
+    def available(self) -> bool:
+        """Whether a request can be sent to the node now."""
+        if self.state == CIRCUIT_CLOSED:
+            return True
+        if self.state == CIRCUIT_OPEN:
+            return self.opened_until <= time.monotonic()
+        return not self._probing
+
+    def acquire(self) -> bool:
+        """Take permission to send a request, False if the circuit doesn't allow it."""
+        if not self.available:
+            return False
+        if self.state != CIRCUIT_CLOSED:
+            self._set_state(CIRCUIT_HALF_OPEN)
+            self._probing = True
+        return True
+
+    def release(self) -> None:
+        """Give the probe back when the request ended without a result."""
+        self._probing = False
+
+    def record_success(self, latency: float) -> None:
+        self.requests += 1
+        self.consecutive_failures = 0
+        self._probing = False
+        self._set_state(CIRCUIT_CLOSED)
+        if self.latency is None:
+            self.latency = latency
+        else:
+            self.latency += SMOOTHING * (latency - self.latency)
+        self.error_rate -= SMOOTHING * self.error_rate
+
+    def record_failure(self) -> None:
+        self.requests += 1
+        self.failures += 1
+        self.consecutive_failures += 1
+        self.error_rate += SMOOTHING * (1 - self.error_rate)
+        if (
+            self.state == CIRCUIT_HALF_OPEN
+            or self.consecutive_failures >= self.max_failures
+        ):
+            self.opened_until = time.monotonic() + self.recovery_time
+            self._set_state(CIRCUIT_OPEN)
+        self._probing = False
+
+    @property
+    def score(self) -> float:
+        # Nodes without latency samples go first, so every node gets measured,
+        # errors push the node back even if it answers fast
+        latency = self.latency if self.latency is not None else 0.0
+        return latency * (1 + 10 * self.error_rate) + self.error_rate
+
+
+class NodePool:
+    """Set of node urls serving the same network.
+
+    Requests are routed to the node with the best latency score. Nodes with an
+    open circuit are skipped, nodes waiting for a probe request go last.
+    """
+
+    def __init__(
+        self,
+        urls: list[str],
+        max_failures: int = 3,
+        recovery_time: float = 30,
+        on_state_change: Optional[CircuitStateCallback] = None,
+    ):
+        if not urls:
+            raise ValueError("At least one node url is required")
+        self.endpoints = [
+            NodeEndpoint(url, max_failures, recovery_time, on_state_change)
+            for url in urls
+        ]
+        self._latencies: deque[float] = deque(maxlen=LATENCY_SAMPLES)
+
+    def candidates(self) -> list[NodeEndpoint]:
+        """Endpoints which can take a request, in the order they should be tried."""
+        closed = [e for e in self.endpoints if e.state == CIRCUIT_CLOSED]
+        probes = [
+            e for e in self.endpoints if e.state != CIRCUIT_CLOSED and e.available
+        ]
+        closed.sort(key=lambda endpoint: endpoint.score)
+        probes.sort(key=lambda endpoint: endpoint.opened_until)
+        return closed + probes
+
+    def retry_after(self) -> float:
+        """Seconds until the first open circuit lets a probe request through."""
+        return max(
+            0.0,
+            min(endpoint.opened_until for endpoint in self.endpoints)
+            - time.monotonic(),
+        )
+
+    def record_success(self, endpoint: NodeEndpoint, latency: float) -> None:
+        endpoint.record_success(latency)
+        self._latencies.append(latency)
+
+    def latency_percentile(self, percentile: float) -> Optional[float]:
+        """Latency of recent successful requests at the given percentile (0-1)."""
+        if not self._latencies:
+            return None
+        latencies = sorted(self._latencies)
+        index = min(len(latencies) - 1, int(percentile * len(latencies)))
+        return latencies[index]
+
+    def record_failure(self, endpoint: NodeEndpoint) -> None:
+        endpoint.record_failure()
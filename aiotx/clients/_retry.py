@@ -0,0 +1,120 @@
+import asyncio
+import random
+from typing import Awaitable, Callable, Optional, TypeVar
+
+import aiohttp
+
+from aiotx.exceptions import BlockNotFoundError, RpcConnectionError
+from aiotx.log import logger
+
+T = TypeVar("T")
+
+# Errors which usually go away after some time: node is overloaded, block is
+# not propagated yet, network problems
+DEFAULT_RETRY_ON = (
+    RpcConnectionError,
+    BlockNotFoundError,
+    aiohttp.ClientError,
+    asyncio.TimeoutError,
+)
+
+
+class RetryBudget:
+    """Limits retries to a share of successful calls.
+
+    Every retry takes one token, every successful call gives back ``ratio`` of
+    a token, up to ``capacity`` tokens. When the node is down, calls sharing
+    the budget stop retrying after ``capacity`` retries instead of multiplying
+    the load on the node.
+    """
+
+    def __init__(self, ratio: float = 0.2, capacity: float = 10):
+        self.ratio = ratio
+        self.capacity = capacity
+        self.tokens = capacity
+
+    def record_success(self) -> None:
+        self.tokens = min(self.capacity, self.tokens + self.ratio)
+
+    def try_withdraw(self) -> bool:
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+
+class RetryPolicy:
+    """Decides which errors are retried and how long to wait between attempts.
+
+    The delay grows as ``base_delay * 2 ** attempt`` up to ``max_delay``, and a
+    random part of it (``jitter`` share) is taken off, so concurrent calls
+    which failed together don't retry together. If the error has retry_after
+    (node sent Retry-After, or all node circuits are open), the delay is at
+    least that long.
+
+    Exceptions matching ``retry_on`` are retried unless they match
+    ``no_retry_on``. Redefine ``is_retryable`` for other rules.
+
+    One policy can be shared by many concurrent calls, they share its
+    ``budget`` as well::
+
+        policy = RetryPolicy(max_retries=5, budget=RetryBudget())
+        balance = await policy.call(client.get_balance, address)
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 10,
+        base_delay: float = 0.2,
+        max_delay: float = 30,
+        jitter: float = 0.5,
+        budget: Optional[RetryBudget] = None,
+        retry_on: tuple[type[BaseException], ...] = DEFAULT_RETRY_ON,
+        no_retry_on: tuple[type[BaseException], ...] = (),
+    ):
+        # Total number of attempts, the first one included
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.budget = budget
+        self.retry_on = retry_on
+        self.no_retry_on = no_retry_on
+
+    def is_retryable(self, error: BaseException) -> bool:
+        return isinstance(error, self.retry_on) and not isinstance(
+            error, self.no_retry_on
+        )
+
+    def get_delay(self, attempt: int, error: Optional[BaseException] = None) -> float:
+        """Seconds to wait before the retry after the given (0-based) attempt."""
+        delay = min(self.max_delay, self.base_delay * 2**attempt)
+        delay *= 1 - self.jitter * random.random()
+        retry_after = getattr(error, "retry_after", None)
+        if retry_after:
+            delay = max(delay, retry_after)
+        return delay
+
+    async def call(
+        self, request_func: Callable[..., Awaitable[T]], *args, **kwargs
+    ) -> T:
+        """Call ``request_func`` and retry it on retryable errors."""
+        for attempt in range(self.max_retries):
+            try:
+                result = await request_func(*args, **kwargs)
+            except Exception as e:
+                if (
+                    attempt >= self.max_retries - 1
+                    or not self.is_retryable(e)
+                    or (self.budget is not None and not self.budget.try_withdraw())
+                ):
+                    raise
+                delay = self.get_delay(attempt, e)
+                logger.warning(
+                    f"{type(e).__name__} {e}, retrying in {delay:.2f} seconds... (Attempt {attempt + 1}/{self.max_retries})"
+                )
+                await asyncio.sleep(delay)
+            else:
+                if self.budget is not None:
+                    self.budget.record_success()
+                return result
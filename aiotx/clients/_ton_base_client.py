@@ -1,7 +1,6 @@
 import asyncio
 import base64
 import decimal
-import json
 import time
 from typing import Optional, Union
 
@@ -12,7 +11,7 @@ from aiotx.exceptions import (
     RpcConnectionError,
     WrongPrivateKey,
 )
-from aiotx.log import logger
+from aiotx.log import LazyPayload, logger, payload_method, should_log_payload
 from aiotx.utils.tonsdk.boc import Cell
 from aiotx.utils.tonsdk.contract.wallet import Wallets, WalletVersionEnum
 from aiotx.utils.tonsdk.crypto import mnemonic_new
@@ -23,14 +22,17 @@ from aiotx.utils.tonsdk.utils import to_nano as tonsdk_to_nano
 
 
 class AioTxTONClient(AioTxClient):
+    _hedged_rpc_methods = frozenset({"getBlockTransactions", "getAddressBalance"})
+
     def __init__(
         self,
         node_url: str,
         headers: dict = {},
         wallet_version: WalletVersionEnum = WalletVersionEnum.v4r2,
         workchain: Optional[int] = None,
+        **kwargs,
     ):
-        super().__init__(node_url, headers)
+        super().__init__(node_url, headers, **kwargs)
         self.monitor = TonMonitor(self)
         self._monitoring_task = None
         self.workchain = workchain
@@ -369,12 +371,12 @@ class AioTxTONClient(AioTxClient):
         headers.update(self._headers)
 
         target_url = self.node_url + "/runGetMethod"
-        data = json.dumps({"address": address, "method": method, "stack": stack})
+        payload = {"address": address, "method": method, "stack": stack}
 
         response = await self._make_request(
-            "POST", target_url, data=data, headers=headers
+            "POST", target_url, **self._encode_json(payload, headers)
         )
-        result = await response.json()
+        result = self._decode_json(await response.read())
         if result["ok"]:
             return result["result"]
         else:
@@ -385,19 +387,25 @@ class AioTxTONClient(AioTxClient):
 
         payload["jsonrpc"] = "2.0"
         payload["id"] = 1
-        payload_json = json.dumps(payload)
         headers = {"Content-Type": "application/json"}
         headers.update(self._headers)
-        logger.info(f"rpc call payload: {payload}")
+        log_payload = should_log_payload(payload_method(payload))
+        if log_payload:
+            logger.info("rpc call payload: %s", LazyPayload(payload))
 
         response = await self._make_request(
-            "POST", self.node_url + "/jsonRPC", data=payload_json, headers=headers
+            "POST",
+            self.node_url + "/jsonRPC",
+            hedge=self._can_hedge(payload),
+            **self._encode_json(payload, headers),
         )
 
-        response_text = await response.text()
-        logger.info(f"rpc call result: {response_text}")
+        body = await response.read()
+        if log_payload:
+            logger.info("rpc call result: %s", LazyPayload(body))
 
         if response.status != 200:
+            response_text = body.decode(errors="replace")
             if "cannot find block" in response_text:
                 raise BlockNotFoundError(response_text)
             if "Incorrect address" in response_text:
@@ -405,7 +413,7 @@ class AioTxTONClient(AioTxClient):
             raise RpcConnectionError(
                 f"Node response status code: {response.status} response test: {response_text}"
             )
-        result = await response.json()
+        result = self._decode_json(body)
         return result["result"]
 
 
@@ -497,12 +505,13 @@ class TonMonitor(BlockMonitor):
 
     async def process_master_block(self, block):
         for handler in self.block_handlers:
-            await handler(block)
+            await self._call_handler(handler, block)
+        await self._end_block()
 
     async def process_shard_transactions(self, shard_transactions):
         for handler in self.block_transactions_handlers:
-            await handler(shard_transactions)
+            await self._call_handler(handler, shard_transactions)
 
         for transaction in shard_transactions:
             for handler in self.transaction_handlers:
-                await handler(transaction)
+                await self._call_handler(handler, transaction)
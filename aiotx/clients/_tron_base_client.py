@@ -1,5 +1,6 @@
 import decimal
 import json
+from contextlib import aclosing
 from decimal import localcontext
 from typing import Optional, Union
 
@@ -9,14 +10,18 @@ from tronpy import Tron
 from tronpy.keys import PrivateKey
 
 from aiotx.clients._base_client import BlockMonitor
-from aiotx.clients._evm_base_client import AioTxEVMBaseClient
+from aiotx.clients._evm_base_client import (
+    AddressFilteredHandlersMixin,
+    AioTxEVMBaseClient,
+    decode_transactions_input,
+)
 from aiotx.exceptions import (
     CreateTransactionError,
     InvalidArgumentError,
     RpcConnectionError,
     TransactionNotFound,
 )
-from aiotx.log import logger
+from aiotx.log import LazyPayload, logger, payload_method, should_log_payload
 from aiotx.types import BlockParam
 
 units = {
@@ -33,8 +38,9 @@ class AioTxTRONClient(AioTxEVMBaseClient):
         self,
         node_url: str,
         headers: dict = {},
+        **kwargs,
     ):
-        super().__init__(node_url, headers)
+        super().__init__(node_url, headers, **kwargs)
         self.monitor = TronMonitor(self)
         self._monitoring_task = None
         trc20_abi_json = pkg_resources.resource_string("aiotx.utils", "trc20_abi.json")
@@ -379,50 +385,76 @@ class AioTxTRONClient(AioTxEVMBaseClient):
 
     async def _make_api_call(self, payload, method, path) -> dict:
         url = self.node_url + path
-        logger.info(f"api call payload: {payload} method: {method} path: {path}")
+        log_payload = should_log_payload(path)
+        if log_payload:
+            logger.info(
+                "api call payload: %s method: %s path: %s",
+                LazyPayload(payload),
+                method,
+                path,
+            )
 
         headers = {"Content-Type": "application/json"} if method == "POST" else {}
         headers.update(self._headers)
 
         if method == "POST":
-            payload_json = json.dumps(payload)
             response = await self._make_request(
-                method, url, data=payload_json, headers=headers
+                method, url, **self._encode_json(payload, headers)
             )
         else:
             response = await self._make_request(method, url, headers=headers)
 
-        return await self._process_api_answer(response)
+        return await self._process_api_answer(response, log_payload)
 
-    async def _process_api_answer(self, response: aiohttp.ClientResponse) -> dict:
-        response_text = await response.text()
-        logger.info(f"api call result: {response_text} status: {response.status}")
+    async def _process_api_answer(
+        self, response: aiohttp.ClientResponse, log_payload: bool = True
+    ) -> dict:
+        body = await response.read()
+        if log_payload:
+            logger.info(
+                "api call result: %s status: %s", LazyPayload(body), response.status
+            )
         if response.status != 200:
             raise RpcConnectionError(
-                f"Node response status code: {response.status} response test: {response_text}"
+                f"Node response status code: {response.status} response test: {body.decode(errors='replace')}"
             )
-        result = await response.json()
-        return result
+        return self._decode_json(body)
 
     async def _make_rpc_call(self, payload, path="/jsonrpc") -> dict:
         payload["jsonrpc"] = "2.0"
-        payload["id"] = 1
-        payload_json = json.dumps(payload)
-        logger.info(f"rpc call payload: {payload}")
+        if path == "/jsonrpc":
+            result = await self._send_rpc_payload(payload, 1)
+        else:
+            payload["id"] = 1
+            result = await self._post_rpc(payload, path)
+        return self._process_rpc_result(result)
+
+    async def _post_rpc(
+        self, payload: Union[dict, list], path="/jsonrpc"
+    ) -> Union[dict, list]:
+        log_payload = should_log_payload(payload_method(payload))
+        if log_payload:
+            logger.info("rpc call payload: %s", LazyPayload(payload))
         headers = {"Content-Type": "application/json"}
         headers.update(self._headers)
 
         response = await self._make_request(
-            "POST", self.node_url + path, data=payload_json, headers=headers
+            "POST",
+            self.node_url + path,
+            hedge=self._can_hedge(payload),
+            **self._encode_json(payload, headers),
         )
 
-        response_text = await response.text()
-        logger.info(f"rpc call result: {response_text}")
+        body = await response.read()
+        if log_payload:
+            logger.info("rpc call result: %s", LazyPayload(body))
         if response.status != 200:
             raise RpcConnectionError(
-                f"Node response status code: {response.status} response test: {response_text}"
+                f"Node response status code: {response.status} response test: {body.decode(errors='replace')}"
             )
-        result = await response.json()
+        return self._decode_json(body)
+
+    def _process_rpc_result(self, result: dict):
         if "error" not in result.keys():
             return result["result"]
         error_code = result["error"]["code"]
@@ -437,7 +469,10 @@ class AioTxTRONClient(AioTxEVMBaseClient):
             raise RpcConnectionError(f"Error {error_code}: {error_message}")
 
 
-class TronMonitor(BlockMonitor):
+class TronMonitor(AddressFilteredHandlersMixin, BlockMonitor):
+    # Decode transaction input only when a handler reads it
+    lazy_input_decoding: bool = False
+
     def __init__(
         self,
         client: AioTxTRONClient,
@@ -449,20 +484,41 @@ class TronMonitor(BlockMonitor):
         self.block_handlers = []
         self.transaction_handlers = []
         self.block_transactions_handlers = []
+        self.address_transaction_handlers = []
+        self._address_handler_index: dict[str, list[int]] = {}
         self.running = False
         self._last_block = last_block
+        self._network_last_block: Optional[int] = None
         self.max_retries = max_retries
         self.retry_delay = retry_delay
 
+    def _normalize_address(self, address: str) -> str:
+        # Node gives transaction addresses as 0x hex, without the 41 prefix
+        if address.startswith("T"):
+            address = self.client.base58_to_hex_address(address)
+        if address.startswith("41") and len(address) == 42:
+            address = "0x" + address[2:]
+        return address.lower()
+
     async def poll_blocks(self, _: int):
-        network_last_block = await self._make_request_with_retry(
-            self.client.get_last_block_number
-        )
-        target_block = (
-            network_last_block if self._latest_block is None else self._latest_block
-        )
+        target_block = self._latest_block
+        # Blocks up to the last known network block exist for sure, so the
+        # network is asked again only when we get to it
+        if (
+            target_block is None
+            or self._network_last_block is None
+            or target_block > self._network_last_block
+        ):
+            self._network_last_block = await self._make_request_with_retry(
+                self.client.get_last_block_number
+            )
+        network_last_block = self._network_last_block
+        if target_block is None:
+            target_block = network_last_block
         if target_block > network_last_block:
             return
+        if self.prefetch_window > 1:
+            return await self._catch_up(target_block, network_last_block)
         block_data = await self._make_request_with_retry(
             self.client.get_block_by_number,
             target_block,
@@ -471,16 +527,29 @@ class TronMonitor(BlockMonitor):
         await self.process_block(target_block, network_last_block)
         self._latest_block = target_block + 1
 
+    async def _catch_up(self, target_block: int, network_last_block: int) -> bool:
+        blocks = self._fetch_blocks_in_order(
+            self.client.get_block_by_number,
+            range(target_block, network_last_block + 1),
+            self.prefetch_window,
+        )
+        async with aclosing(blocks):
+            async for block_number, block_data in blocks:
+                await self.process_transactions(block_data["transactions"])
+                await self.process_block(block_number, network_last_block)
+                self._latest_block = block_number + 1
+        return True
+
     async def process_block(self, block, network_last_block):
         for handler in self.block_handlers:
-            await handler(block, network_last_block)
+            await self._call_handler(handler, block, network_last_block)
+        await self._end_block()
 
     async def process_transactions(self, transactions):
+        decode_transactions_input(
+            transactions, self.client.decode_transaction_input, self.lazy_input_decoding
+        )
         for transaction in transactions:
-            transaction["aiotx_decoded_input"] = self.client.decode_transaction_input(
-                transaction["input"]
-            )
-            for handler in self.transaction_handlers:
-                await handler(transaction)
+            await self._handle_transaction(transaction)
         for handler in self.block_transactions_handlers:
-            await handler(transactions)
+            await self._call_handler(handler, transactions)
@@ -1,6 +1,7 @@
 import asyncio
-import json
 import sys
+import time
+from contextlib import aclosing
 from decimal import Decimal
 from typing import Optional, Union
 
@@ -19,11 +20,14 @@ from aiotx.exceptions import (
     NotImplementedError,
     RpcConnectionError,
 )
-from aiotx.log import logger
-from aiotx.types import FeeEstimate, UTXOType
+from aiotx.log import LazyPayload, logger, payload_method, should_log_payload
+from aiotx.types import BackfillProgress, FeeEstimate, UTXOType
+from aiotx.utils.bloom_filter import BloomFilter
 
 
 class AioTxUTXOClient(AioTxClient):
+    _hedged_rpc_methods = frozenset({"getrawtransaction", "getblockhash", "getblock"})
+
     def __init__(
         self,
         node_url: str,
@@ -33,6 +37,13 @@ class AioTxUTXOClient(AioTxClient):
         node_password,
         network_name,
         db_url,
+        bloom_filter_error_rate: Optional[float] = None,
+        db_pool_size: int = 5,
+        db_max_overflow: int = 10,
+        db_pool_timeout: float = 30,
+        db_pool_recycle: int = 3600,
+        db_pool_pre_ping: bool = True,
+        **kwargs,
     ):
         try:
             from bitcoinlib.networks import Network
@@ -45,13 +56,60 @@ class AioTxUTXOClient(AioTxClient):
             )
             sys.exit(-1)
 
-        super().__init__(node_url, headers)
+        super().__init__(node_url, headers, **kwargs)
         self.node_username = node_username
         self.node_password = node_password
         self.testnet = testnet
         self._network = Network(network_name)
-        self.monitor = UTXOMonitor(self, db_url)
-        asyncio.run(self.monitor._init_db())
+        self.monitor = UTXOMonitor(
+            self,
+            db_url,
+            bloom_filter_error_rate,
+            db_pool_options={
+                "pool_size": db_pool_size,
+                "max_overflow": db_max_overflow,
+                "pool_timeout": db_pool_timeout,
+                "pool_recycle": db_pool_recycle,
+                "pool_pre_ping": db_pool_pre_ping,
+            },
+        )
+        self._initialized = False
+        self._init_lock = asyncio.Lock()
+
+    async def init(self) -> None:
+        """Create database tables and save the start block, once.
+
+        ``connect()`` and the methods which use the database call it, so it
+        only has to be awaited directly to initialize the client up front.
+        """
+        if self._initialized:
+            return
+        async with self._init_lock:
+            if not self._initialized:
+                await self.monitor._init_db()
+                self._initialized = True
+
+    async def connect(self) -> None:
+        await super().connect()
+        await self.init()
+
+    async def disconnect(self) -> None:
+        await super().disconnect()
+        await self.monitor._close_db()
+
+    async def start_monitoring(
+        self,
+        monitoring_start_block: Optional[int] = None,
+        timeout_between_blocks: int = 1,
+        **kwargs,
+    ) -> None:
+        # UTXO clients were always usable without connect(), so keep it that way.
+        # The session can be open already after an RPC call, but connect()
+        # still creates the database tables then.
+        await self.connect()
+        await super().start_monitoring(
+            monitoring_start_block, timeout_between_blocks, **kwargs
+        )
 
     @staticmethod
     def to_satoshi(amount: Union[int, float, str]) -> int:
@@ -91,6 +149,7 @@ class AioTxUTXOClient(AioTxClient):
         }
 
     async def import_address(self, address: str, block_number: Optional[int] = None):
+        await self.init()
         await self.monitor._add_new_address(address, block_number)
 
     async def get_last_block_number(self) -> int:
@@ -98,18 +157,25 @@ class AioTxUTXOClient(AioTxClient):
         result = await self._make_rpc_call(payload)
         return result["result"]
 
-    async def get_block_by_number(self, block_number: int, verbosity: int = 2):
+    async def get_block_hash(self, block_number: int) -> str:
         payload = {"method": "getblockhash", "params": [block_number]}
-        block_hash = await self._make_rpc_call(payload)
-        payload = {"method": "getblock", "params": [block_hash["result"], verbosity]}
+        result = await self._make_rpc_call(payload)
+        return result["result"]
+
+    async def get_block_by_number(self, block_number: int, verbosity: int = 2):
+        block_hash = await self.get_block_hash(block_number)
+        payload = {"method": "getblock", "params": [block_hash, verbosity]}
         result = await self._make_rpc_call(payload)
         return result["result"]
 
     async def get_balance(self, address: str) -> int:
-        utxo_data: list[UTXOType] = await self.monitor._get_utxo_data(address)
-        if len(utxo_data) == 0:
-            return 0
-        return sum(utxo.amount_satoshi for utxo in utxo_data)
+        await self.init()
+        return await self.monitor._get_balance(address)
+
+    async def get_balances(self, addresses: Optional[list[str]] = None) -> dict:
+        """Balances of the addresses, of all imported addresses by default."""
+        await self.init()
+        return await self.monitor._get_balances(addresses)
 
     async def speed_up_transaction_by_self_child_payment(
         self,
@@ -123,6 +189,7 @@ class AioTxUTXOClient(AioTxClient):
         from_wallet = self.get_address_from_private_key(private_key)
         from_address = from_wallet["address"]
 
+        await self.init()
         outputs_from_slow_transaction = await self.monitor._get_utxo(tx_id)
         address_utxo_list: list[UTXOType] = await self.monitor._get_utxo_data(
             from_address
@@ -214,6 +281,7 @@ class AioTxUTXOClient(AioTxClient):
     ) -> str:
         from_wallet = self.get_address_from_private_key(private_key)
         from_address = from_wallet["address"]
+        await self.init()
         utxo_list: list[UTXOType] = await self.monitor._get_utxo_data(from_address)
 
         if total_fee is None:
@@ -406,49 +474,74 @@ class AioTxUTXOClient(AioTxClient):
         result = await self._make_rpc_call(payload)
         return self.to_satoshi(result["result"]["feerate"])
 
-    def _check_connection(self) -> None:
-        return None
+    def _session_kwargs(self) -> dict:
+        return {"auth": aiohttp.BasicAuth(self.node_username, self.node_password)}
 
     async def _make_rpc_call(self, payload) -> dict:
+        if not self._connected:
+            # UTXO clients were always usable without connect(), so keep it that
+            # way. Don't init here, init itself asks the node for the last block.
+            await super().connect()
         payload["jsonrpc"] = "2.0"
-        payload["id"] = "curltest"
-        logger.info(f"rpc call payload: {payload}")
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                self.node_url,
-                data=json.dumps(payload),
-                headers=self._headers,
-                auth=aiohttp.BasicAuth(self.node_username, self.node_password),
-            ) as response:
-                if response.status != 200:
-                    raise RpcConnectionError(await response.text())
-                result = await response.json()
-                error = result.get("error")
-                logger.info(f"rpc call result: {result}")
-                if error is None:
-                    return result
-
-                error_code = error.get("code")
-                error_message = error.get("message")
-                if error_code == -5:
-                    raise BlockNotFoundError(error_message)
-                elif error_code == -8:
-                    raise InvalidArgumentError(error_message)
-                elif error_code == -32600:
-                    raise InvalidRequestError(error_message)
-                elif error_code == -32601:
-                    raise MethodNotFoundError(error_message)
-                elif error_code == -32603:
-                    raise InternalJSONRPCError(error_message)
-                else:
-                    raise RpcConnectionError(f"Error {error_code}: {error_message}")
+        result = await self._send_rpc_payload(payload, "curltest")
+        return self._process_rpc_result(result)
+
+    async def _post_rpc(self, payload: Union[dict, list]) -> Union[dict, list]:
+        log_payload = should_log_payload(payload_method(payload))
+        if log_payload:
+            logger.info("rpc call payload: %s", LazyPayload(payload))
+        response = await self._make_request(
+            "POST",
+            self.node_url,
+            hedge=self._can_hedge(payload),
+            **self._encode_json(payload, self._headers),
+        )
+        body = await response.read()
+        if response.status != 200:
+            raise RpcConnectionError(body.decode(errors="replace"))
+        if log_payload:
+            logger.info("rpc call result: %s", LazyPayload(body))
+        result = self._decode_json(body)
+        return result
+
+    def _process_rpc_result(self, result: dict) -> dict:
+        error = result.get("error")
+        if error is None:
+            return result
+
+        error_code = error.get("code")
+        error_message = error.get("message")
+        if error_code == -5:
+            raise BlockNotFoundError(error_message)
+        elif error_code == -8:
+            raise InvalidArgumentError(error_message)
+        elif error_code == -32600:
+            raise InvalidRequestError(error_message)
+        elif error_code == -32601:
+            raise MethodNotFoundError(error_message)
+        elif error_code == -32603:
+            raise InternalJSONRPCError(error_message)
+        else:
+            raise RpcConnectionError(f"Error {error_code}: {error_message}")
 
 
 class UTXOMonitor(BlockMonitor):
-    def __init__(self, client: AioTxUTXOClient, db_url):
+    # How often (seconds) backfill progress is reported
+    progress_interval: float = 10
+    # Max number of addresses in one get_balances query
+    balance_query_chunk_size: int = 500
+
+    def __init__(
+        self,
+        client: AioTxUTXOClient,
+        db_url,
+        bloom_filter_error_rate: Optional[float] = None,
+        db_pool_options: Optional[dict] = None,
+    ):
+        from sqlalchemy.engine import make_url
         from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
         from sqlalchemy.orm import sessionmaker
-        from sqlalchemy.pool import NullPool
+        from sqlalchemy.pool import StaticPool
 
         from aiotx.utils.utxo_db_models import (
             create_address_model,
@@ -461,15 +554,34 @@ class UTXOMonitor(BlockMonitor):
         self.transaction_handlers = []
         self.new_utxo_transaction_handlers = []
         self.block_transactions_handlers = []
+        self.backfill_progress_handlers = []
         self.running = False
         self._db_url = db_url
-        self._engine = create_async_engine(db_url, poolclass=NullPool)
+        url = make_url(db_url)
+        self._in_memory_db = url.get_backend_name() == "sqlite" and url.database in (
+            None,
+            "",
+            ":memory:",
+        )
+        if self._in_memory_db:
+            # In-memory database lives as long as its only connection
+            engine_options = {"poolclass": StaticPool}
+        else:
+            engine_options = db_pool_options or {}
+        self._engine = create_async_engine(db_url, **engine_options)
         self._session = sessionmaker(
             self._engine, class_=AsyncSession, expire_on_commit=False
         )
         self.Address = create_address_model(self.client._network.name)
         self.UTXO = create_utxo_model(self.client._network.name)
         self.LastBlock = create_last_block_model(self.client._network.name)
+        # Watched addresses and unspent outpoints, loaded from the database
+        # once and then kept in sync, so blocks are matched in memory.
+        # With bloom_filter_error_rate they are Bloom filters and matches
+        # are confirmed by the database.
+        self._bloom_filter_error_rate = bloom_filter_error_rate
+        self._address_index: Optional[Union[set, BloomFilter]] = None
+        self._outpoint_index: Optional[Union[set, BloomFilter]] = None
 
     async def poll_blocks(self, _: int):
         network_last_block = await self.client.get_last_block_number()
@@ -478,17 +590,59 @@ class UTXOMonitor(BlockMonitor):
             local_latest_block = network_last_block
         if network_last_block < local_latest_block:
             return
+        if self.prefetch_window > 1:
+            return await self._catch_up(local_latest_block, network_last_block)
         block_data = await self.client.get_block_by_number(local_latest_block)
         await self.process_block(local_latest_block, block_data)
-        next_block = local_latest_block + 1
-        await self._update_last_block(next_block)
+
+    def on_backfill_progress(self, func):
+        self.backfill_progress_handlers.append(func)
+        return func
+
+    async def _catch_up(self, start_block: int, network_last_block: int) -> bool:
+        """Fetch blocks concurrently, but apply them to the UTXO set one by one
+        in block order, so spends always see the outputs they spend."""
+        progress = BackfillProgress(
+            start_block=start_block,
+            target_block=network_last_block,
+            current_block=start_block - 1,
+        )
+        started_at = reported_at = time.monotonic()
+        blocks = self._fetch_blocks_in_order(
+            self.client.get_block_by_number,
+            range(start_block, network_last_block + 1),
+            self.prefetch_window,
+        )
+        async with aclosing(blocks):
+            async for block_number, block_data in blocks:
+                await self.process_block(block_number, block_data)
+
+                now = time.monotonic()
+                progress.current_block = block_number
+                progress.processed_blocks += 1
+                progress.elapsed = now - started_at
+                is_backfill_done = (
+                    block_number == network_last_block and block_number > start_block
+                )
+                if now - reported_at >= self.progress_interval or is_backfill_done:
+                    reported_at = now
+                    await self._report_progress(progress)
+        return True
+
+    async def _report_progress(self, progress: BackfillProgress) -> None:
+        logger.info(
+            f"Backfill: block {progress.current_block}/{progress.target_block}, "
+            f"{progress.blocks_per_second:.1f} blocks/sec"
+        )
+        for handler in self.backfill_progress_handlers:
+            await handler(progress)
 
     async def process_block(self, block_number, block_data):
-        await self._update_last_block(block_number)
         for handler in self.block_handlers:
-            await handler(block_number)
+            await self._call_handler(handler, block_number)
 
-        addresses = await self._get_addresses()
+        await self._load_indexes()
+        new_outputs = []
         for transaction in block_data["tx"]:
             for output in transaction["vout"]:
                 outputs_scriptPubKey = output.get("scriptPubKey")
@@ -506,39 +660,144 @@ class UTXOMonitor(BlockMonitor):
                 else:
                     to_address = output_address
 
-                if to_address not in addresses:
+                if to_address not in self._address_index:
                     continue
+                new_outputs.append((transaction, to_address, output))
 
-                value = self.client.to_satoshi(output["value"])
-                output_n = output["n"]
-                await self._add_new_utxo(
-                    to_address, transaction["txid"], value, output_n
-                )
-
-                for handler in self.new_utxo_transaction_handlers:
-                    await handler(transaction)
-
-        all_utxo_tx_ids = await self._get_all_utxo_tx_ids()
+        if new_outputs and self._bloom_filter_error_rate is not None:
+            watched = await self._get_watched_addresses(
+                {to_address for _, to_address, _ in new_outputs}
+            )
+            new_outputs = [item for item in new_outputs if item[1] in watched]
+
+        new_utxos = [
+            {
+                "tx_id": transaction["txid"],
+                "output_n": output["n"],
+                "address": to_address,
+                "amount_satoshi": self.client.to_satoshi(output["value"]),
+                "used": False,
+            }
+            for transaction, to_address, output in new_outputs
+        ]
+        new_outpoints = {
+            _outpoint_key(utxo["tx_id"], utxo["output_n"]) for utxo in new_utxos
+        }
+        spent_outpoints = []
         for transaction in block_data["tx"]:
             for input_utxo in transaction["vin"]:
                 txid = input_utxo.get("txid")
                 vout = input_utxo.get("vout")
                 if txid is None or vout is None:
                     continue
-                if txid in all_utxo_tx_ids:
-                    await self._process_input_utxo(txid, vout)
+                # Bloom filter false positives just don't delete anything
+                key = _outpoint_key(txid, vout)
+                if key in self._outpoint_index or key in new_outpoints:
+                    spent_outpoints.append((txid, vout))
+
+        await self._apply_block(new_utxos, spent_outpoints)
+
+        for transaction, to_address, _ in new_outputs:
+            for handler in self.new_utxo_transaction_handlers:
+                await self._call_handler(handler, transaction, address=to_address)
 
         for transaction in block_data["tx"]:
             for handler in self.transaction_handlers:
-                await handler(transaction)
+                await self._call_handler(handler, transaction)
         for handler in self.block_transactions_handlers:
-            await handler(block_data["tx"])
+            await self._call_handler(handler, block_data["tx"])
+        await self._end_block()
+        # Only now the block is processed, if a handler fails it's processed
+        # again after restart, so no events are lost
+        await self._update_last_block(block_number + 1)
+
+    async def _apply_block(
+        self,
+        new_utxos: list[dict],
+        spent_outpoints: list[tuple[str, int]],
+    ) -> None:
+        """Save new and spent UTXOs of the block in one transaction, so a crash
+        can't leave half of a block."""
+        from sqlalchemy import delete, tuple_
+
+        async with self._session() as session:
+            async with session.begin():
+                if new_utxos:
+                    upsert = self._utxo_upsert_statement()
+                    if upsert is not None:
+                        await session.execute(upsert, new_utxos)
+                    else:
+                        for utxo in new_utxos:
+                            await session.merge(self.UTXO(**utxo))
+                if spent_outpoints:
+                    await session.execute(
+                        delete(self.UTXO).where(
+                            tuple_(self.UTXO.tx_id, self.UTXO.output_n).in_(
+                                spent_outpoints
+                            )
+                        )
+                    )
+
+        for utxo in new_utxos:
+            self._outpoint_index.add(_outpoint_key(utxo["tx_id"], utxo["output_n"]))
+        if isinstance(self._outpoint_index, set):
+            for tx_id, output_n in spent_outpoints:
+                self._outpoint_index.discard(_outpoint_key(tx_id, output_n))
+
+    def _utxo_upsert_statement(self):
+        """Bulk insert which marks already known UTXOs unused again, None if
+        the database doesn't support it."""
+        dialect = self._engine.dialect.name
+        if dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert
+
+            return insert(self.UTXO).on_conflict_do_update(
+                index_elements=["tx_id", "output_n"], set_={"used": False}
+            )
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+
+            return insert(self.UTXO).on_conflict_do_update(
+                index_elements=["tx_id", "output_n"], set_={"used": False}
+            )
+        if dialect in ("mysql", "mariadb"):
+            from sqlalchemy.dialects.mysql import insert
+
+            return insert(self.UTXO).on_duplicate_key_update(used=False)
+        return None
+
+    def _new_index(self, items: set) -> Union[set, BloomFilter]:
+        if self._bloom_filter_error_rate is None:
+            return items
+        # Leave room for new items, the filter is rebuilt when it's full
+        index = BloomFilter(max(2 * len(items), 10000), self._bloom_filter_error_rate)
+        for item in items:
+            index.add(item)
+        return index
+
+    async def _load_indexes(self) -> None:
+        if self._index_needs_reload(self._address_index):
+            self._address_index = self._new_index(await self._get_addresses())
+        if self._index_needs_reload(self._outpoint_index):
+            self._outpoint_index = self._new_index(await self._get_all_outpoints())
+
+    @staticmethod
+    def _index_needs_reload(index: Optional[Union[set, BloomFilter]]) -> bool:
+        return index is None or (isinstance(index, BloomFilter) and index.is_full)
+
+    async def _close_db(self) -> None:
+        # Closing the only connection of an in-memory database deletes it
+        if not self._in_memory_db:
+            # Pool opens new database connections when they are needed again
+            await self._engine.dispose()
 
     async def _init_db(self) -> None:
         from aiotx.utils.utxo_db_models import Base
 
         async with self._engine.begin() as conn:
             await conn.run_sync(Base.metadata.create_all)
+            # Tables created by older versions don't have the indexes yet
+            await conn.run_sync(self._create_missing_indexes)
             try:
                 last_known_block = await self.client.get_last_block_number()
             except (ClientError, ClientOSError) as e:
@@ -548,6 +807,11 @@ class UTXOMonitor(BlockMonitor):
             else:
                 await self._init_last_block(last_known_block)
 
+    def _create_missing_indexes(self, connection) -> None:
+        for model in (self.Address, self.UTXO, self.LastBlock):
+            for index in model.__table__.indexes:
+                index.create(connection, checkfirst=True)
+
     async def _drop_tables(self) -> None:
         from aiotx.utils.utxo_db_models import Base
 
@@ -573,6 +837,8 @@ class UTXOMonitor(BlockMonitor):
                         self.Address(address=address, block_number=block_number)
                     )
                 await session.commit()
+        if self._address_index is not None:
+            self._address_index.add(address)
         last_known_block = await self._get_last_block()
         if last_known_block is None or last_known_block > block_number:
             await self._update_last_block(block_number)
@@ -601,6 +867,8 @@ class UTXOMonitor(BlockMonitor):
                         )
                     )
                 await session.commit()
+        if self._outpoint_index is not None:
+            self._outpoint_index.add(_outpoint_key(tx_id, output_n))
 
     async def _update_last_block(self, block_number: int) -> None:
         from sqlalchemy import select
@@ -626,10 +894,50 @@ class UTXOMonitor(BlockMonitor):
                     session.add(self.LastBlock(block_number=block_number))
                 await session.commit()
 
-    async def _process_input_utxo(self, txid: str, vout: int) -> None:
-        utxo_list: list[UTXOType] = await self._get_utxo(txid, vout)
-        for utxo in utxo_list:
-            await self._delete_utxo(utxo.tx_id, utxo.output_n)
+    async def _get_balance(self, address: str) -> int:
+        from sqlalchemy import false, func, select
+
+        async with self._session() as session:
+            result = await session.execute(
+                select(func.coalesce(func.sum(self.UTXO.amount_satoshi), 0)).where(
+                    (self.UTXO.address == address) & (self.UTXO.used == false())
+                )
+            )
+            return int(result.scalar_one())
+
+    async def _get_balances(self, addresses: Optional[list[str]] = None) -> dict:
+        from sqlalchemy import false, func, select
+
+        balance = func.coalesce(func.sum(self.UTXO.amount_satoshi), 0)
+        async with self._session() as session:
+            if addresses is None:
+                result = await session.execute(
+                    select(self.Address.address, balance)
+                    .outerjoin(
+                        self.UTXO,
+                        (self.UTXO.address == self.Address.address)
+                        & (self.UTXO.used == false()),
+                    )
+                    .group_by(self.Address.address)
+                )
+                return {address: int(amount) for address, amount in result}
+
+            balances = dict.fromkeys(addresses, 0)
+            addresses = list(balances)
+            # Databases limit the number of query parameters
+            for i in range(0, len(addresses), self.balance_query_chunk_size):
+                result = await session.execute(
+                    select(self.UTXO.address, balance)
+                    .where(
+                        self.UTXO.address.in_(
+                            addresses[i : i + self.balance_query_chunk_size]
+                        )
+                        & (self.UTXO.used == false())
+                    )
+                    .group_by(self.UTXO.address)
+                )
+                balances.update((address, int(amount)) for address, amount in result)
+            return balances
 
     async def _get_utxo_data(self, address: str, spent=False) -> list[UTXOType]:
         from sqlalchemy import select
@@ -693,21 +1001,13 @@ class UTXOMonitor(BlockMonitor):
                 for row in rows
             ]
 
-    async def _get_all_utxo_tx_ids(self) -> list[str]:
-        from sqlalchemy import select
-
-        """
-        Function to optimize UTXO checking on new block to not make a SELECT for each input in the block
-        """
-        async with self._session() as session:
-            result = await session.execute(select(self.UTXO.tx_id))
-            return {row[0] for row in result.fetchall()}
-
     async def _delete_utxo(self, tx_id: str, output_n: int) -> None:
         async with self._session() as session:
             async with session.begin():
                 await session.delete(await session.get(self.UTXO, (tx_id, output_n)))
                 await session.commit()
+        if isinstance(self._outpoint_index, set):
+            self._outpoint_index.discard(_outpoint_key(tx_id, output_n))
 
     async def _get_last_block(self) -> Optional[int]:
         from sqlalchemy import select
@@ -722,3 +1022,23 @@ class UTXOMonitor(BlockMonitor):
         async with self._session() as session:
             result = await session.execute(select(self.Address.address))
             return {row[0] for row in result.fetchall()}
+
+    async def _get_watched_addresses(self, addresses: set[str]) -> set[str]:
+        from sqlalchemy import select
+
+        async with self._session() as session:
+            result = await session.execute(
+                select(self.Address.address).where(self.Address.address.in_(addresses))
+            )
+            return {row[0] for row in result.fetchall()}
+
+    async def _get_all_outpoints(self) -> set[str]:
+        from sqlalchemy import select
+
+        async with self._session() as session:
+            result = await session.execute(select(self.UTXO.tx_id, self.UTXO.output_n))
+            return {_outpoint_key(tx_id, output_n) for tx_id, output_n in result}
+
+
+def _outpoint_key(tx_id: str, output_n: int) -> str:
+    return f"{tx_id}:{output_n}"
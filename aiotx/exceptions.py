@@ -1,3 +1,6 @@
+from typing import Optional
+
+
 class AioTxError(Exception):
     """
     Base exception for all aiotx errors.
@@ -92,6 +95,27 @@ class RpcConnectionError(AioTxError):
     pass
 
 
+class RateLimitExceededError(RpcConnectionError):
+    """
+    Node answered with 429 status, retry_after is the delay it asked for (if any).
+    """
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class CircuitOpenError(RpcConnectionError):
+    """
+    Circuits of all nodes are open after failures, so the request wasn't sent.
+    retry_after is the number of seconds until a node accepts a probe request.
+    """
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
 class CreateTransactionError(AioTxError):
     pass
 
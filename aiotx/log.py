@@ -1,7 +1,16 @@
 import logging
+from collections import defaultdict
+from typing import Any, Optional
 
 logger = logging.getLogger(__name__)
 
+# Payloads and responses longer than that are cut in logs, None logs them whole
+_payload_log_limit: Optional[int] = 10000
+# RPC method -> share of calls (0-1) with logged payloads
+_payload_sample_rates: dict[str, float] = {}
+_default_payload_sample_rate = 1.0
+_payload_log_counters: defaultdict[str, int] = defaultdict(int)
+
 
 class ColoredFormatter(logging.Formatter):
     COLOR_CODES = {
@@ -36,6 +45,77 @@ def set_logger_level(level):
         )
 
 
+def set_payload_logging(
+    limit: Optional[int] = 10000,
+    sample_rates: Optional[dict[str, float]] = None,
+    default_sample_rate: float = 1.0,
+):
+    """
+    Configure logging of RPC payloads and responses (INFO level).
+
+    Args:
+        limit (int, optional): Maximum number of characters logged for one
+            payload or response, None to log them whole.
+        sample_rates (dict, optional): Share of calls (0-1) which are logged,
+            per RPC method (or API path), for example {"eth_getBlockByNumber": 0.01}.
+        default_sample_rate (float): Share of logged calls for other methods.
+    """
+    global _payload_log_limit, _default_payload_sample_rate, _payload_sample_rates
+    _payload_log_limit = limit
+    _payload_sample_rates = dict(sample_rates or {})
+    _default_payload_sample_rate = default_sample_rate
+    _payload_log_counters.clear()
+
+
+def payload_method(payload: Any) -> Optional[str]:
+    """RPC method of the payload, "batch" for batch requests."""
+    if isinstance(payload, list):
+        return "batch"
+    if isinstance(payload, dict):
+        return payload.get("method")
+    return None
+
+
+def should_log_payload(method: Optional[str]) -> bool:
+    """Whether payload and response of this call should be logged.
+
+    Check it once per call, so the payload and the response of the same call
+    are either both logged or both skipped.
+    """
+    if not logger.isEnabledFor(logging.INFO):
+        return False
+    rate = _payload_sample_rates.get(method, _default_payload_sample_rate)
+    if rate >= 1:
+        return True
+    # Every 1/rate call is logged, that's steadier than random sampling
+    count = _payload_log_counters[method] = _payload_log_counters[method] + 1
+    return int(count * rate) != int((count - 1) * rate)
+
+
+class LazyPayload:
+    """Payload or response body formatted only when the log record is emitted.
+
+    Bytes are decoded at that moment too, and only up to the log limit.
+    """
+
+    __slots__ = ("value",)
+
+    def __init__(self, value: Any):
+        self.value = value
+
+    def __str__(self) -> str:
+        limit = _payload_log_limit
+        if isinstance(self.value, (bytes, bytearray)):
+            size = len(self.value)
+            text = bytes(self.value[:limit]).decode(errors="replace")
+        else:
+            text = str(self.value)
+            size = len(text)
+        if limit is not None and size > limit:
+            return f"{text[:limit]}... ({size} total)"
+        return text
+
+
 handler = logging.StreamHandler()
 handler.setFormatter(ColoredFormatter())
 logger.addHandler(handler)
@@ -23,3 +23,22 @@ class UTXOType:
     address: str
     amount_satoshi: int
     used: bool
+
+
+@dataclass
+class BackfillProgress:
+    start_block: int
+    target_block: int
+    current_block: int
+    processed_blocks: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def blocks_per_second(self) -> float:
+        if self.elapsed == 0:
+            return 0.0
+        return self.processed_blocks / self.elapsed
+
+    @property
+    def remaining_blocks(self) -> int:
+        return self.target_block - self.current_block
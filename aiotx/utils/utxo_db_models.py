@@ -1,4 +1,4 @@
-from sqlalchemy import BigInteger, Boolean, Column, Integer, String
+from sqlalchemy import BigInteger, Boolean, Column, Index, Integer, String
 from sqlalchemy.orm import declarative_base
 
 Base = declarative_base()
@@ -26,6 +26,14 @@ def create_utxo_model(currency_name):
         amount_satoshi = Column(BigInteger)
         used = Column(Boolean, default=False)
 
+    # Unspent outputs of an address and their balance are read from the index
+    # alone. Lookups by tx_id use the primary key, it starts with tx_id.
+    # The model can be created again for the same table, add the index once.
+    index_name = f"ix_{currency_name}_utxo_address_used_amount"
+    table = UTXO.__table__
+    if not any(index.name == index_name for index in table.indexes):
+        Index(index_name, table.c.address, table.c.used, table.c.amount_satoshi)
+
     return UTXO
 
 
@@ -29,6 +29,10 @@ extras_utxo = [
     "bitcoinlib==0.7.*",
 ]
 
+extras_orjson = [
+    "orjson",
+]
+
 
 setup(
     name="aiotx",
@@ -66,6 +70,7 @@ setup(
         "test": extras_test,
         "utxo": extras_utxo,
         "evm": extras_evm,
+        "orjson": extras_orjson,
     },
     url="https://github.com/Grommash9/aiotx",
     project_urls={
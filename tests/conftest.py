@@ -4,7 +4,8 @@ import os
 
 import pytest
 import vcr
-from pytest import FixtureRequest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
 
 from aiotx.clients import (
     AioTxBSCClient,
@@ -45,6 +46,147 @@ vcr_c = vcr.VCR(
 )
 
 
+class FakeRpcNode:
+    """Local JSON-RPC node answering from a method -> result mapping."""
+
+    def __init__(self):
+        self.results = {}
+        self.requests = []
+        self.request_headers = []
+        self.delay = 0
+        # Delay between the response headers and the body
+        self.body_delay = 0
+        self.status = 200
+        self.headers = {}
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.server = TestServer(self._build_app())
+
+    def _build_app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_post("/{tail:.*}", self._handle)
+        return app
+
+    def _answer(self, call: dict) -> dict:
+        result = self.results.get(call["method"])
+        if callable(result):
+            result = result(*call["params"])
+        if isinstance(result, dict) and "code" in result:
+            return {"jsonrpc": "2.0", "id": call["id"], "error": result}
+        return {"jsonrpc": "2.0", "id": call["id"], "result": result}
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        self.requests.append(body)
+        self.request_headers.append(request.headers)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            response = self._respond(body)
+            if self.body_delay:
+                return await self._stream(request, response)
+            return response
+        finally:
+            self.in_flight -= 1
+
+    def _respond(self, body) -> web.Response:
+        if self.status != 200:
+            return web.Response(
+                status=self.status, text="node is unavailable", headers=self.headers
+            )
+        if isinstance(body, list):
+            return web.json_response([self._answer(call) for call in body])
+        return web.json_response(self._answer(body))
+
+    async def _stream(
+        self, request: web.Request, response: web.Response
+    ) -> web.StreamResponse:
+        stream = web.StreamResponse(status=response.status, headers=response.headers)
+        await stream.prepare(request)
+        await asyncio.sleep(self.body_delay)
+        await stream.write(response.body)
+        await stream.write_eof()
+        return stream
+
+    @property
+    def url(self) -> str:
+        return str(self.server.make_url("/"))
+
+
+@pytest.fixture
+async def rpc_node() -> FakeRpcNode:
+    node = FakeRpcNode()
+    await node.server.start_server()
+    yield node
+    await node.server.close()
+
+
+@pytest.fixture
+async def backup_rpc_node() -> FakeRpcNode:
+    node = FakeRpcNode()
+    await node.server.start_server()
+    yield node
+    await node.server.close()
+
+
+UTXO_ADDRESS = "tb1qwatched0000000000000000000000000000000"
+FUNDING_TX = "a" * 64
+SPENDING_TX = "b" * 64
+SECOND_FUNDING_TX = "c" * 64
+
+
+def utxo_output(address, value, n=0):
+    return {"value": value, "n": n, "scriptPubKey": {"address": address}}
+
+
+UTXO_BLOCK_TRANSACTIONS = {
+    11: [{"txid": FUNDING_TX, "vin": [{}], "vout": [utxo_output(UTXO_ADDRESS, 1.0)]}],
+    12: [
+        {
+            "txid": SPENDING_TX,
+            "vin": [{"txid": FUNDING_TX, "vout": 0}],
+            "vout": [utxo_output("tb1qother", 0.9)],
+        }
+    ],
+    13: [
+        {
+            "txid": SECOND_FUNDING_TX,
+            "vin": [{}],
+            "vout": [utxo_output(UTXO_ADDRESS, 0.5)],
+        }
+    ],
+}
+
+
+def get_utxo_block(block_hash, _):
+    block_number = int(block_hash)
+    return {
+        "height": block_number,
+        "tx": UTXO_BLOCK_TRANSACTIONS.get(block_number, []),
+    }
+
+
+@pytest.fixture
+def utxo_node(rpc_node) -> FakeRpcNode:
+    """Local Bitcoin node at block 20, block hashes are the block numbers."""
+    rpc_node.results["getblockcount"] = 20
+    rpc_node.results["getblockhash"] = str
+    rpc_node.results["getblock"] = get_utxo_block
+    return rpc_node
+
+
+@pytest.fixture
+async def utxo_client(request, utxo_node, tmp_path) -> AioTxBTCClient:
+    """Not connected BTC client of utxo_node with a SQLite database in
+    tmp_path, indirect parametrization passes extra client params."""
+    params = {"db_url": f"sqlite+aiosqlite:///{tmp_path}/utxo.sqlite"}
+    params.update(getattr(request, "param", {}))
+    client = AioTxBTCClient(utxo_node.url, testnet=True, **params)
+    yield client
+    await client.disconnect()
+
+
 @pytest.fixture
 async def ton_client() -> AioTxTONClient:
     # current test rpc connection returning -1 as workchain but it should be 0,
@@ -103,64 +245,58 @@ async def eth_client() -> AioTxETHClient:
 
 
 @pytest.fixture
-@vcr_c.use_cassette("ltc/create_client.yaml")
-def ltc_public_client(request: FixtureRequest) -> AioTxLTCClient:
-    def teardown():
-        try:
-            os.remove("test_ltc.sqlite")
-        except FileNotFoundError:
-            print("test_ltc.sqlite FileNotFoundError")
-
-    request.addfinalizer(teardown)
+async def ltc_public_client() -> AioTxLTCClient:
     client = AioTxLTCClient(
         LTC_TEST_NODE_URL, testnet=True, db_url="sqlite+aiosqlite:///test_ltc.sqlite"
     )
-    return client
+    with vcr_c.use_cassette("ltc/create_client.yaml"):
+        await client.init()
+    yield client
+    await client.disconnect()
+    try:
+        os.remove("test_ltc.sqlite")
+    except FileNotFoundError:
+        print("test_ltc.sqlite FileNotFoundError")
 
 
 @pytest.fixture
-@vcr_c.use_cassette("btc/create_client.yaml")
-def btc_client(request: FixtureRequest) -> AioTxBTCClient:
-    def teardown():
-        try:
-            os.remove("test_btc.sqlite")
-        except FileNotFoundError:
-            print("test_btc.sqlite FileNotFoundError")
-
-    request.addfinalizer(teardown)
+async def btc_client() -> AioTxBTCClient:
     client = AioTxBTCClient(
         BTC_TEST_NODE_URL, testnet=True, db_url="sqlite+aiosqlite:///test_btc.sqlite"
     )
-    return client
+    with vcr_c.use_cassette("btc/create_client.yaml"):
+        await client.init()
+    yield client
+    await client.disconnect()
+    try:
+        os.remove("test_btc.sqlite")
+    except FileNotFoundError:
+        print("test_btc.sqlite FileNotFoundError")
 
 
 @pytest.fixture
-@vcr_c.use_cassette("btc/create_client_mysql.yaml")
-def btc_client_mysql(request: FixtureRequest) -> AioTxBTCClient:
+async def btc_client_mysql() -> AioTxBTCClient:
     aiotx_btc_mysql_client = AioTxBTCClient(
         BTC_TEST_NODE_URL,
         testnet=True,
         db_url=f"mysql+aiomysql://{os.getenv('DB_USER')}:{os.getenv('DB_PASSWORD')}@{os.getenv('DB_HOST')}:{os.getenv('DB_PORT')}/{os.getenv('DB_NAME')}",
     )
-
-    def teardown():
-        asyncio.run(aiotx_btc_mysql_client.monitor._drop_tables())
-
-    request.addfinalizer(teardown)
-    return aiotx_btc_mysql_client
+    with vcr_c.use_cassette("btc/create_client_mysql.yaml"):
+        await aiotx_btc_mysql_client.init()
+    yield aiotx_btc_mysql_client
+    await aiotx_btc_mysql_client.monitor._drop_tables()
+    await aiotx_btc_mysql_client.disconnect()
 
 
 @pytest.fixture
-@vcr_c.use_cassette("ltc/create_client_mysql.yaml")
-def ltc_client_mysql(request: FixtureRequest) -> AioTxLTCClient:
+async def ltc_client_mysql() -> AioTxLTCClient:
     aiotx_ltc_mysql_client = AioTxLTCClient(
         LTC_TEST_NODE_URL,
         testnet=True,
         db_url=f"mysql+aiomysql://{os.getenv('DB_USER')}:{os.getenv('DB_PASSWORD')}@{os.getenv('DB_HOST')}:{os.getenv('DB_PORT')}/{os.getenv('DB_NAME')}",
     )
-
-    def teardown():
-        asyncio.run(aiotx_ltc_mysql_client.monitor._drop_tables())
-
-    request.addfinalizer(teardown)
-    return aiotx_ltc_mysql_client
+    with vcr_c.use_cassette("ltc/create_client_mysql.yaml"):
+        await aiotx_ltc_mysql_client.init()
+    yield aiotx_ltc_mysql_client
+    await aiotx_ltc_mysql_client.monitor._drop_tables()
+    await aiotx_ltc_mysql_client.disconnect()
@@ -0,0 +1,91 @@
+from unittest.mock import patch
+
+import pytest
+
+from aiotx.clients import AioTxETHClient, AioTxTRONClient
+
+WATCHED = "0xAbCdEf0000000000000000000000000000000001"
+TOKEN_RECIPIENT = "0x1234567890123456789012345678901234567890"
+TRANSFER_INPUT = (
+    "0xa9059cbb"
+    "0000000000000000000000001234567890123456789012345678901234567890"
+    "0000000000000000000000000000000000000000000000000000000000000064"
+)
+APPROVE_INPUT = "0x095ea7b3" + TRANSFER_INPUT[10:]
+TRANSACTIONS = [
+    {"hash": "sent", "from": WATCHED.lower(), "to": "0xother", "input": "0x"},
+    {"hash": "received", "from": "0xother", "to": WATCHED.lower(), "input": "0x"},
+    {"hash": "token", "from": "0xother", "to": "0xtoken", "input": TRANSFER_INPUT},
+    {"hash": "unrelated", "from": "0xother", "to": None, "input": "0x"},
+]
+
+
+@pytest.mark.parametrize("lazy_input_decoding", [False, True])
+async def test_handlers_get_transactions_of_their_addresses(lazy_input_decoding):
+    client = AioTxETHClient("http://localhost")
+    client.monitor.lazy_input_decoding = lazy_input_decoding
+    calls = []
+
+    @client.monitor.on_transaction
+    async def handle_all(transaction):
+        calls.append(("all", transaction["hash"]))
+
+    @client.monitor.on_transaction(addresses=[WATCHED])
+    async def handle_watched(transaction):
+        calls.append(("watched", transaction["hash"]))
+
+    @client.monitor.on_transaction(addresses=[TOKEN_RECIPIENT.upper(), WATCHED])
+    async def handle_token(transaction):
+        calls.append(("token", transaction["hash"]))
+
+    block = {"number": hex(1), "transactions": [dict(tx) for tx in TRANSACTIONS]}
+    await client.monitor.process_block(block, 1)
+
+    assert [call for call in calls if call[0] != "all"] == [
+        ("watched", "sent"),
+        ("token", "sent"),
+        ("watched", "received"),
+        ("token", "received"),
+        ("token", "token"),
+    ]
+    assert len([call for call in calls if call[0] == "all"]) == 4
+
+
+async def test_lazy_mode_decodes_only_transfers_for_address_handlers():
+    client = AioTxETHClient("http://localhost")
+    client.monitor.lazy_input_decoding = True
+    received = []
+
+    @client.monitor.on_transaction(addresses=[TOKEN_RECIPIENT])
+    async def handle_transaction(transaction):
+        received.append(transaction["hash"])
+
+    transactions = [dict(tx) for tx in TRANSACTIONS] + [
+        {"hash": "approve", "from": "0xother", "to": "0xtoken", "input": APPROVE_INPUT},
+        {"hash": "unknown", "from": "0xother", "to": "0xdex", "input": "0x12345678"},
+    ]
+    block = {"number": hex(1), "transactions": transactions}
+    with patch.object(
+        client, "decode_transaction_input", wraps=client.decode_transaction_input
+    ) as decode:
+        await client.monitor.process_block(block, 1)
+
+    assert received == ["token"]
+    decode.assert_called_once_with(TRANSFER_INPUT)
+
+
+async def test_tron_addresses_are_normalized():
+    client = AioTxTRONClient("http://localhost")
+    base58_address = client.hex_address_to_base58(TOKEN_RECIPIENT)
+    received = []
+
+    @client.monitor.on_transaction(addresses=[base58_address])
+    async def handle_transaction(transaction):
+        received.append(transaction["hash"])
+
+    await client.monitor.process_transactions([dict(tx) for tx in TRANSACTIONS])
+
+    assert received == ["token"]
+    assert client.monitor._normalize_address(
+        "41" + TOKEN_RECIPIENT[2:]
+    ) == client.monitor._normalize_address(base58_address)
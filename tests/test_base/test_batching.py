@@ -0,0 +1,132 @@
+import asyncio
+
+import pytest
+
+from aiotx.clients import AioTxETHClient
+from aiotx.exceptions import NonceTooLowError, TransactionNotFound
+
+
+async def test_concurrent_calls_are_sent_as_one_batch(rpc_node):
+    rpc_node.results["eth_getBalance"] = lambda address, _: hex(int(address[-1]))
+    client = AioTxETHClient(rpc_node.url, batch_max_size=100, batch_window=0.05)
+    await client.connect()
+
+    addresses = [f"0x{'0' * 39}{i}" for i in range(5)]
+    balances = await asyncio.gather(*[client.get_balance(a) for a in addresses])
+
+    assert balances == [0, 1, 2, 3, 4]
+    assert len(rpc_node.requests) == 1
+    assert len(rpc_node.requests[0]) == 5
+    assert len({call["id"] for call in rpc_node.requests[0]}) == 5
+    await client.disconnect()
+
+
+async def test_batch_is_flushed_when_max_size_reached(rpc_node):
+    rpc_node.results["eth_blockNumber"] = "0x10"
+    client = AioTxETHClient(rpc_node.url, batch_max_size=2, batch_window=10)
+    await client.connect()
+
+    results = await asyncio.wait_for(
+        asyncio.gather(*[client.get_last_block_number() for _ in range(4)]), 1
+    )
+
+    assert results == [16, 16, 16, 16]
+    assert [len(batch) for batch in rpc_node.requests] == [2, 2]
+    await client.disconnect()
+
+
+async def test_batch_item_errors_are_mapped_per_call(rpc_node):
+    rpc_node.results["eth_gasPrice"] = "0x5"
+    rpc_node.results["eth_sendRawTransaction"] = {
+        "code": -32000,
+        "message": "nonce too low",
+    }
+    client = AioTxETHClient(rpc_node.url, batch_max_size=10)
+    await client.connect()
+
+    payload = {"method": "eth_sendRawTransaction", "params": ["0x00"]}
+    gas_price, send_result = await asyncio.gather(
+        client.get_gas_price(), client._make_rpc_call(payload), return_exceptions=True
+    )
+
+    assert gas_price == 5
+    assert isinstance(send_result, NonceTooLowError)
+    await client.disconnect()
+
+
+async def test_single_calls_are_not_batched_by_default(rpc_node):
+    rpc_node.results["eth_chainId"] = "0x61"
+    client = AioTxETHClient(rpc_node.url)
+    await client.connect()
+
+    assert await client.get_chain_id() == 97
+    assert rpc_node.requests == [
+        {"method": "eth_chainId", "params": [], "jsonrpc": "2.0", "id": 1}
+    ]
+    await client.disconnect()
+
+
+async def test_explicit_batch_resolves_futures_on_exit(rpc_node):
+    rpc_node.results["eth_getBalance"] = "0x64"
+    rpc_node.results["eth_call"] = "0x0a"
+    rpc_node.results["eth_getTransactionReceipt"] = {"status": "0x1"}
+    client = AioTxETHClient(rpc_node.url)
+    await client.connect()
+
+    async with client.batch() as b:
+        balance = b.get_balance("0x" + "1" * 40)
+        token_balance = b.get_contract_balance("0x" + "1" * 40, "0x" + "2" * 40)
+        receipt = b.get_transaction_receipt("0x" + "3" * 64)
+        assert rpc_node.requests == []
+
+    assert balance.result() == 100
+    assert token_balance.result() == 10
+    assert receipt.result() == {"status": "0x1"}
+    assert len(rpc_node.requests) == 1
+    assert [call["method"] for call in rpc_node.requests[0]] == [
+        "eth_getBalance",
+        "eth_call",
+        "eth_getTransactionReceipt",
+    ]
+    await client.disconnect()
+
+
+async def test_explicit_batch_keeps_errors_per_future(rpc_node):
+    rpc_node.results["eth_getBalance"] = "0x1"
+    rpc_node.results["eth_getTransactionReceipt"] = None
+    client = AioTxETHClient(rpc_node.url)
+    await client.connect()
+
+    async with client.batch() as b:
+        balance = b.get_balance("0x" + "1" * 40)
+        receipt = b.get_transaction_receipt("0x" + "3" * 64)
+
+    assert balance.result() == 1
+    with pytest.raises(TransactionNotFound):
+        receipt.result()
+    await client.disconnect()
+
+
+async def test_explicit_batch_waits_for_fanned_out_calls(rpc_node):
+    rpc_node.results["eth_getBalance"] = "0x1"
+    client = AioTxETHClient(rpc_node.url)
+    await client.connect()
+
+    async def get_total_balance(*addresses):
+        balances = await asyncio.gather(*[client.get_balance(a) for a in addresses])
+        return sum(balances)
+
+    async def run_batch():
+        async with client.batch() as b:
+            total = b.get_total_balance("0x" + "1" * 40, "0x" + "2" * 40)
+            balance = b.get_balance("0x" + "3" * 40)
+        return total, balance
+
+    client.get_total_balance = get_total_balance
+    total, balance = await asyncio.wait_for(run_batch(), 2)
+
+    assert total.result() == 2
+    assert balance.result() == 1
+    assert len(rpc_node.requests) == 1
+    assert len(rpc_node.requests[0]) == 3
+    await client.disconnect()
@@ -0,0 +1,79 @@
+import asyncio
+
+from aiotx.clients import AioTxETHClient, AioTxTRONClient
+
+
+def make_block(number: str, _):
+    return {"number": number, "transactions": []}
+
+
+async def test_evm_monitor_catches_up_in_order(rpc_node):
+    rpc_node.results["eth_blockNumber"] = hex(40)
+    rpc_node.results["eth_getBlockByNumber"] = make_block
+    rpc_node.delay = 0.01
+    client = AioTxETHClient(rpc_node.url)
+    await client.connect()
+    processed = []
+
+    @client.monitor.on_block
+    async def handle_block(block, latest_block):
+        processed.append(block)
+        if block == 40:
+            client.stop_monitoring()
+
+    await asyncio.wait_for(
+        client.start_monitoring(
+            monitoring_start_block=1, timeout_between_blocks=10, prefetch_window=8
+        ),
+        5,
+    )
+
+    assert processed == list(range(1, 41))
+    assert 1 < rpc_node.max_in_flight <= 8
+    await client.disconnect()
+
+
+async def test_prefetched_blocks_are_cancelled_on_stop(rpc_node):
+    rpc_node.results["eth_blockNumber"] = hex(1000)
+    rpc_node.results["eth_getBlockByNumber"] = make_block
+    client = AioTxETHClient(rpc_node.url)
+    await client.connect()
+
+    @client.monitor.on_block
+    async def handle_block(block, latest_block):
+        if block == 5:
+            client.stop_monitoring()
+            await asyncio.sleep(1)
+
+    await asyncio.wait_for(
+        client.start_monitoring(monitoring_start_block=1, prefetch_window=4), 5
+    )
+
+    block_requests = [r for r in rpc_node.requests if r["method"] != "eth_blockNumber"]
+    assert len(block_requests) < 20
+    assert client.monitor._latest_block == 5
+    await client.disconnect()
+
+
+async def test_tron_monitor_refreshes_head_only_at_last_known_block(rpc_node):
+    rpc_node.results["eth_blockNumber"] = hex(30)
+    rpc_node.results["eth_getBlockByNumber"] = make_block
+    client = AioTxTRONClient(rpc_node.url)
+    await client.connect()
+    processed = []
+
+    @client.monitor.on_block
+    async def handle_block(block, latest_block):
+        processed.append(block)
+        if block == 30:
+            client.stop_monitoring()
+
+    await asyncio.wait_for(
+        client.start_monitoring(monitoring_start_block=11, prefetch_window=4), 5
+    )
+
+    assert processed == list(range(11, 31))
+    # Once at the start and once more after reaching block 30
+    head_requests = [r for r in rpc_node.requests if r["method"] == "eth_blockNumber"]
+    assert len(head_requests) <= 2
+    await client.disconnect()
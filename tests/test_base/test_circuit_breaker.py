@@ -0,0 +1,71 @@
+import pytest
+
+from aiotx.clients import AioTxETHClient
+from aiotx.clients._node_pool import CIRCUIT_CLOSED, CIRCUIT_OPEN
+from aiotx.exceptions import CircuitOpenError, RpcConnectionError
+
+
+async def test_circuit_opens_after_max_failures(rpc_node, backup_rpc_node):
+    rpc_node.status = 503
+    backup_rpc_node.status = 503
+    changes = []
+    client = AioTxETHClient(
+        [rpc_node.url, backup_rpc_node.url],
+        node_max_failures=2,
+        node_recovery_time=30,
+        on_circuit_state_change=lambda *change: changes.append(change),
+    )
+    await client.connect()
+
+    for _ in range(2):
+        with pytest.raises(RpcConnectionError):
+            await client.get_last_block_number()
+    assert all(e.state == CIRCUIT_OPEN for e in client._node_pool.endpoints)
+    assert sorted(changes) == sorted(
+        [
+            (rpc_node.url, CIRCUIT_CLOSED, CIRCUIT_OPEN),
+            (backup_rpc_node.url, CIRCUIT_CLOSED, CIRCUIT_OPEN),
+        ]
+    )
+
+    # Open circuits fail fast without sending anything to the nodes
+    with pytest.raises(CircuitOpenError) as exc_info:
+        await client.get_last_block_number()
+    assert 29 < exc_info.value.retry_after <= 30
+    assert len(rpc_node.requests) == len(backup_rpc_node.requests) == 2
+    await client.disconnect()
+
+
+async def test_half_open_probe_closes_circuit(rpc_node):
+    rpc_node.status = 503
+    changes = []
+    client = AioTxETHClient(
+        rpc_node.url,
+        node_max_failures=1,
+        node_recovery_time=0,
+        on_circuit_state_change=lambda url, old, new: changes.append(new),
+    )
+    await client.connect()
+
+    with pytest.raises(RpcConnectionError):
+        await client.get_last_block_number()
+    # Failed probe opens the circuit again
+    with pytest.raises(RpcConnectionError):
+        await client.get_last_block_number()
+
+    rpc_node.status = 200
+    rpc_node.results["eth_blockNumber"] = "0x7"
+    assert await client.get_last_block_number() == 7
+    assert changes == ["open", "half_open", "open", "half_open", "closed"]
+    await client.disconnect()
+
+
+async def test_only_one_probe_is_sent_to_half_open_node(rpc_node):
+    client = AioTxETHClient(rpc_node.url, node_max_failures=1, node_recovery_time=0)
+    endpoint = client._node_pool.endpoints[0]
+    client._node_pool.record_failure(endpoint)
+
+    assert endpoint.acquire()
+    assert not endpoint.acquire()
+    endpoint.release()
+    assert endpoint.acquire()
@@ -0,0 +1,42 @@
+import pytest
+
+from aiotx.clients import AioTxETHClient, JsonCodec
+from aiotx.clients._codec import get_codec
+
+
+class CountingCodec(JsonCodec):
+    def __init__(self):
+        self.loads_calls = 0
+
+    def loads(self, data: bytes):
+        self.loads_calls += 1
+        return super().loads(data)
+
+
+async def test_response_is_parsed_once(rpc_node):
+    rpc_node.results["eth_chainId"] = "0x61"
+    codec = CountingCodec()
+    client = AioTxETHClient(rpc_node.url, json_codec=codec)
+    await client.connect()
+
+    assert await client.get_chain_id() == 97
+    assert codec.loads_calls == 1
+    await client.disconnect()
+
+
+async def test_orjson_codec(rpc_node):
+    pytest.importorskip("orjson")
+    rpc_node.results["eth_blockNumber"] = "0x10"
+    client = AioTxETHClient(rpc_node.url, json_codec="orjson")
+    await client.connect()
+
+    assert await client.get_last_block_number() == 16
+    assert rpc_node.requests[0]["method"] == "eth_blockNumber"
+    await client.disconnect()
+
+
+def test_get_codec():
+    assert type(get_codec("json")) is JsonCodec
+    assert isinstance(get_codec("auto"), JsonCodec)
+    with pytest.raises(ValueError):
+        get_codec("yaml")
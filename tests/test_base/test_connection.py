@@ -0,0 +1,45 @@
+import asyncio
+
+import pytest
+
+from aiotx.clients import AioTxETHClient
+
+
+async def test_connector_settings_are_applied(rpc_node):
+    client = AioTxETHClient(
+        rpc_node.url,
+        connection_pool_size=20,
+        connection_limit_per_host=5,
+        keepalive_timeout=30,
+        dns_cache_ttl=60,
+        total_timeout=10,
+        connect_timeout=2,
+        read_timeout=5,
+        http_compression=False,
+    )
+    await client.connect()
+
+    connector = client._session.connector
+    assert connector.limit == 20
+    assert connector.limit_per_host == 5
+    assert client._session.timeout.total == 10
+    assert client._session.timeout.sock_connect == 2
+    assert client._session.timeout.sock_read == 5
+    assert client._session.headers["Accept-Encoding"] == "identity"
+    await client.disconnect()
+
+
+async def test_slow_node_request_times_out(rpc_node):
+    rpc_node.results["eth_blockNumber"] = "0x1"
+    rpc_node.delay = 1
+    client = AioTxETHClient(rpc_node.url, total_timeout=0.1)
+    await client.connect()
+
+    with pytest.raises(asyncio.TimeoutError):
+        await client.get_last_block_number()
+    await client.disconnect()
+
+
+def test_unknown_connection_option_is_rejected():
+    with pytest.raises(TypeError):
+        AioTxETHClient("http://localhost", unknown_option=True)
@@ -0,0 +1,131 @@
+import asyncio
+
+import pytest
+
+from aiotx.clients import AioTxETHClient
+from aiotx.clients._dispatch import HandlerDispatcher
+
+
+async def test_dispatcher_runs_calls_concurrently_and_keeps_key_order():
+    dispatcher = HandlerDispatcher(concurrency=4, queue_size=10)
+    calls = []
+    running = 0
+    max_running = 0
+
+    async def handler(key, n):
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.01 * (3 - n))
+        calls.append((key, n))
+        running -= 1
+
+    # "a" and "b" go to different workers, "c" shares the worker of "a"
+    for n in range(3):
+        for key in ("a", "b", "c"):
+            await dispatcher.submit(key, handler, key, n)
+    await dispatcher.join()
+    await dispatcher.close()
+
+    assert max_running > 1
+    for key in ("a", "b", "c"):
+        assert [n for k, n in calls if k == key] == [0, 1, 2]
+
+
+async def test_dispatcher_queue_is_bounded():
+    dispatcher = HandlerDispatcher(concurrency=1, queue_size=2)
+    release = asyncio.Event()
+
+    async def handler():
+        await release.wait()
+
+    for _ in range(3):
+        await dispatcher.submit(None, handler)
+    # One call runs, two wait in the queue, the next submit has to wait
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(dispatcher.submit(None, handler), 0.05)
+    release.set()
+    await dispatcher.join()
+    await dispatcher.close()
+
+
+async def test_dispatcher_raises_handler_error():
+    dispatcher = HandlerDispatcher(concurrency=2, queue_size=10)
+
+    async def handler():
+        raise ValueError("handler failed")
+
+    await dispatcher.submit(None, handler)
+    with pytest.raises(ValueError):
+        await dispatcher.join()
+    await dispatcher.close()
+
+
+def make_block(number: str, _):
+    return {
+        "number": number,
+        "transactions": [
+            {"hash": f"{number}-{i}", "to": f"0x{i % 2}", "input": "0x"}
+            for i in range(4)
+        ],
+    }
+
+
+@pytest.mark.parametrize("ordering", ["block", "address"])
+async def test_monitor_dispatches_handlers_concurrently(rpc_node, ordering):
+    rpc_node.results["eth_blockNumber"] = hex(5)
+    rpc_node.results["eth_getBlockByNumber"] = make_block
+    client = AioTxETHClient(rpc_node.url)
+    await client.connect()
+    events = []
+    running = 0
+    max_running = 0
+
+    @client.monitor.on_transaction
+    async def handle_transaction(transaction):
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        events.append(("start", transaction["hash"]))
+        await asyncio.sleep(0.01)
+        events.append(("end", transaction["hash"]))
+        running -= 1
+        # Blocks 1-5 have 20 transactions, stop once all of them are handled
+        if len([event for event in events if event[0] == "end"]) == 20:
+            client.stop_monitoring()
+
+    await asyncio.wait_for(
+        client.start_monitoring(
+            monitoring_start_block=1,
+            prefetch_window=5,
+            handler_concurrency=4,
+            handler_queue_size=2,
+            handler_ordering=ordering,
+        ),
+        5,
+    )
+
+    # Queued calls are done before monitoring stops
+    assert len([event for event in events if event[0] == "end"]) == 20
+    assert 1 < max_running <= 4
+    started = [
+        tuple(int(part, 16) for part in tx_hash.split("-"))
+        for event, tx_hash in events
+        if event == "start"
+    ]
+    if ordering == "block":
+        assert [block for block, _ in started] == sorted(block for block, _ in started)
+    else:
+        # Transactions to the same address ("to" is index % 2) start in order
+        for address in (0, 1):
+            same_address = [tx for tx in started if tx[1] % 2 == address]
+            assert same_address == sorted(same_address)
+    await client.disconnect()
+
+
+async def test_unknown_handler_ordering(rpc_node):
+    client = AioTxETHClient(rpc_node.url)
+    await client.connect()
+    with pytest.raises(ValueError):
+        await client.start_monitoring(handler_ordering="random")
+    await client.disconnect()
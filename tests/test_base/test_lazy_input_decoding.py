@@ -0,0 +1,67 @@
+from unittest.mock import patch
+
+import pytest
+
+from aiotx.clients import AioTxETHClient, AioTxTRONClient
+
+TRANSFER_INPUT = (
+    "0xa9059cbb"
+    "0000000000000000000000001234567890123456789012345678901234567890"
+    "0000000000000000000000000000000000000000000000000000000000000064"
+)
+WATCHED_ADDRESS = "0x1234567890123456789012345678901234567890"
+
+
+def make_block():
+    return {
+        "number": hex(10),
+        "transactions": [
+            {"to": "0xother", "input": TRANSFER_INPUT},
+            {"to": WATCHED_ADDRESS, "input": TRANSFER_INPUT},
+            {"to": "0xother", "input": "0x"},
+        ],
+    }
+
+
+async def process_block(client, block):
+    if isinstance(client, AioTxTRONClient):
+        await client.monitor.process_transactions(block["transactions"])
+    else:
+        await client.monitor.process_block(block, 10)
+
+
+@pytest.mark.parametrize("client_class", [AioTxETHClient, AioTxTRONClient])
+async def test_input_is_decoded_when_handler_reads_it(client_class):
+    client = client_class("http://localhost")
+    client.monitor.lazy_input_decoding = True
+    decoded = []
+
+    @client.monitor.on_transaction
+    async def handle_transaction(transaction):
+        if transaction["to"] == WATCHED_ADDRESS:
+            assert "aiotx_decoded_input" in transaction
+            decoded.append(transaction["aiotx_decoded_input"])
+            assert transaction.get("aiotx_decoded_input") is decoded[0]
+
+    with patch.object(
+        client, "decode_transaction_input", wraps=client.decode_transaction_input
+    ) as decode:
+        block = make_block()
+        await process_block(client, block)
+
+    decode.assert_called_once_with(TRANSFER_INPUT)
+    assert decoded[0]["function_name"] == "transfer"
+    assert "aiotx_decoded_input" in block["transactions"][1].keys()
+    assert "aiotx_decoded_input" not in block["transactions"][0].keys()
+    with pytest.raises(KeyError):
+        block["transactions"][0]["unknown"]
+
+
+async def test_input_is_decoded_eagerly_by_default():
+    client = AioTxETHClient("http://localhost")
+    block = make_block()
+
+    await process_block(client, block)
+
+    assert all("aiotx_decoded_input" in tx.keys() for tx in block["transactions"])
+    assert type(block["transactions"][0]) is dict
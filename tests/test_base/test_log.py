@@ -0,0 +1,58 @@
+import logging
+
+import pytest
+
+from aiotx.clients import AioTxETHClient
+from aiotx.log import (
+    LazyPayload,
+    logger,
+    set_payload_logging,
+    should_log_payload,
+)
+
+
+@pytest.fixture
+def payload_logging():
+    level = logger.level
+    logger.setLevel(logging.INFO)
+    yield
+    logger.setLevel(level)
+    set_payload_logging()
+
+
+def test_payload_is_truncated(payload_logging):
+    set_payload_logging(limit=5)
+
+    assert str(LazyPayload(b"0123456789")) == "01234... (10 total)"
+    assert str(LazyPayload({"a": 1})) == "{'a':... (8 total)"
+
+    set_payload_logging(limit=None)
+    assert str(LazyPayload(b"0123456789")) == "0123456789"
+
+
+def test_payload_logging_is_sampled_per_method(payload_logging):
+    set_payload_logging(sample_rates={"eth_getBlockByNumber": 0.25})
+
+    sampled = [should_log_payload("eth_getBlockByNumber") for _ in range(8)]
+
+    assert sampled.count(True) == 2
+    assert should_log_payload("eth_chainId")
+
+
+def test_nothing_is_logged_below_info_level(payload_logging):
+    logger.setLevel(logging.WARNING)
+    assert not should_log_payload("eth_chainId")
+
+
+async def test_rpc_calls_are_logged_lazily(rpc_node, payload_logging, caplog):
+    rpc_node.results["eth_chainId"] = "0x61"
+    client = AioTxETHClient(rpc_node.url)
+    await client.connect()
+
+    with caplog.at_level(logging.INFO, logger="aiotx.log"):
+        await client.get_chain_id()
+
+    messages = [record.getMessage() for record in caplog.records]
+    assert any("rpc call payload: {'method': 'eth_chainId'" in m for m in messages)
+    assert any('rpc call result: {"jsonrpc": "2.0"' in m for m in messages)
+    await client.disconnect()
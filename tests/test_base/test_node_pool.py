@@ -0,0 +1,86 @@
+import asyncio
+
+import pytest
+
+from aiotx.clients import AioTxETHClient
+from aiotx.exceptions import RpcConnectionError
+
+
+async def test_failed_node_is_skipped(rpc_node, backup_rpc_node):
+    rpc_node.status = 503
+    backup_rpc_node.results["eth_blockNumber"] = "0x20"
+    client = AioTxETHClient([rpc_node.url, backup_rpc_node.url])
+    await client.connect()
+
+    assert await client.get_last_block_number() == 32
+    assert len(rpc_node.requests) == 1
+    assert len(backup_rpc_node.requests) == 1
+
+    # Failed node goes to the end of the queue
+    for _ in range(3):
+        await client.get_last_block_number()
+    assert len(rpc_node.requests) == 1
+    assert len(backup_rpc_node.requests) == 4
+    await client.disconnect()
+
+
+async def test_fastest_node_is_preferred(rpc_node, backup_rpc_node):
+    rpc_node.results["eth_blockNumber"] = "0x1"
+    rpc_node.delay = 0.1
+    backup_rpc_node.results["eth_blockNumber"] = "0x1"
+    client = AioTxETHClient([rpc_node.url, backup_rpc_node.url])
+    await client.connect()
+    slow, fast = client._node_pool.endpoints
+    client._node_pool.record_success(slow, 0.1)
+    client._node_pool.record_success(fast, 0.01)
+
+    for _ in range(3):
+        await client.get_last_block_number()
+
+    assert len(rpc_node.requests) == 0
+    assert len(backup_rpc_node.requests) == 3
+    await client.disconnect()
+
+
+async def test_error_is_raised_when_all_nodes_fail(rpc_node, backup_rpc_node):
+    rpc_node.status = 503
+    backup_rpc_node.status = 502
+    client = AioTxETHClient([rpc_node.url, backup_rpc_node.url])
+    await client.connect()
+
+    with pytest.raises(RpcConnectionError):
+        await client.get_last_block_number()
+    assert client.node_url == rpc_node.url
+    await client.disconnect()
+
+
+async def test_slow_read_is_hedged_to_second_node(rpc_node, backup_rpc_node):
+    block = {"number": "0x5", "transactions": []}
+    rpc_node.results["eth_getBlockByNumber"] = block
+    rpc_node.delay = 1
+    backup_rpc_node.results["eth_getBlockByNumber"] = block
+    client = AioTxETHClient(
+        [rpc_node.url, backup_rpc_node.url], hedge_requests=True, hedge_min_delay=0.05
+    )
+    await client.connect()
+
+    result = await asyncio.wait_for(client.get_block_by_number(5), 0.5)
+
+    assert result == block
+    assert len(rpc_node.requests) == 1
+    assert len(backup_rpc_node.requests) == 1
+    await client.disconnect()
+
+
+async def test_writes_are_not_hedged(rpc_node, backup_rpc_node):
+    rpc_node.results["eth_sendRawTransaction"] = "0x" + "1" * 64
+    rpc_node.delay = 0.2
+    client = AioTxETHClient(
+        [rpc_node.url, backup_rpc_node.url], hedge_requests=True, hedge_min_delay=0.05
+    )
+    await client.connect()
+
+    payload = {"method": "eth_sendRawTransaction", "params": ["0x00"]}
+    assert await client._make_rpc_call(payload) == "0x" + "1" * 64
+    assert len(backup_rpc_node.requests) == 0
+    await client.disconnect()
@@ -0,0 +1,123 @@
+import asyncio
+import time
+
+import pytest
+
+from aiotx.clients import AioTxETHClient
+from aiotx.clients._base_client import BlockMonitor
+from aiotx.clients._rate_limit import TokenBucket, parse_retry_after
+from aiotx.exceptions import RateLimitExceededError
+
+
+async def test_token_bucket_limits_rate():
+    bucket = TokenBucket(rate=20, burst=2)
+    started_at = time.monotonic()
+    for _ in range(6):
+        await bucket.acquire()
+    # 2 tokens of burst, then 4 more at 20 per second
+    assert time.monotonic() - started_at >= 0.19
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("3") == 3
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("soon") is None
+    assert 0 <= parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") < 1
+
+
+async def test_max_concurrent_requests(rpc_node):
+    rpc_node.results["eth_blockNumber"] = "0x1"
+    rpc_node.delay = 0.05
+    client = AioTxETHClient(rpc_node.url, max_concurrent_requests=2)
+    await client.connect()
+
+    await asyncio.gather(*[client.get_last_block_number() for _ in range(6)])
+
+    assert len(rpc_node.requests) == 6
+    assert rpc_node.max_in_flight == 2
+    await client.disconnect()
+
+
+async def test_max_concurrent_requests_includes_body_read(rpc_node):
+    rpc_node.results["eth_blockNumber"] = "0x1"
+    rpc_node.body_delay = 0.05
+    client = AioTxETHClient(rpc_node.url, max_concurrent_requests=2)
+    await client.connect()
+
+    await asyncio.gather(*[client.get_last_block_number() for _ in range(6)])
+
+    # Requests reading the body still hold their slots
+    assert rpc_node.max_in_flight == 2
+    await client.disconnect()
+
+
+async def test_rate_limited_response_raises_with_retry_after(rpc_node):
+    rpc_node.status = 429
+    rpc_node.headers = {"Retry-After": "2"}
+    client = AioTxETHClient(rpc_node.url, requests_per_second=100)
+    await client.connect()
+
+    with pytest.raises(RateLimitExceededError) as exc_info:
+        await client.get_last_block_number()
+
+    assert exc_info.value.retry_after == 2
+    # Node asked to wait, so the bucket doesn't give out tokens meanwhile
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(client._rate_limiters[rpc_node.url].acquire(), 0.1)
+    await client.disconnect()
+
+
+async def test_rate_limited_responses_dont_open_circuit(rpc_node):
+    rpc_node.results["eth_blockNumber"] = "0x1"
+    rpc_node.status = 429
+    rpc_node.headers = {"Retry-After": "1"}
+    client = AioTxETHClient(rpc_node.url, requests_per_second=100)
+    await client.connect()
+
+    for _ in range(3):
+        with pytest.raises(RateLimitExceededError) as exc_info:
+            await client.get_last_block_number()
+        assert exc_info.value.retry_after == 1
+    await asyncio.sleep(1.1)
+    rpc_node.status = 200
+
+    # The node only asked to slow down, the circuit stays closed
+    assert await client.get_last_block_number() == 1
+    assert client._node_pool.endpoints[0].state == "closed"
+    await client.disconnect()
+
+
+async def test_rate_limited_request_fails_over(rpc_node, backup_rpc_node):
+    rpc_node.status = 429
+    rpc_node.headers = {"Retry-After": "5"}
+    backup_rpc_node.results["eth_blockNumber"] = "0x2"
+    client = AioTxETHClient(
+        [rpc_node.url, backup_rpc_node.url], requests_per_second=100
+    )
+    await client.connect()
+
+    assert await client.get_last_block_number() == 2
+    assert len(rpc_node.requests) == 1
+    assert client._node_pool.endpoints[0].consecutive_failures == 0
+    await client.disconnect()
+
+
+async def test_retry_waits_for_retry_after(monkeypatch):
+    delays = []
+
+    async def fake_sleep(delay):
+        delays.append(delay)
+
+    calls = []
+
+    async def request():
+        calls.append(1)
+        if len(calls) == 1:
+            raise RateLimitExceededError("rate limit exceeded", retry_after=3)
+        return "ok"
+
+    monkeypatch.setattr(asyncio, "sleep", fake_sleep)
+    monitor = BlockMonitor(client=None)
+
+    assert await monitor._make_request_with_retry(request) == "ok"
+    assert delays == [3]
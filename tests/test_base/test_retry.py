@@ -0,0 +1,82 @@
+import asyncio
+
+import pytest
+
+from aiotx.clients import RetryBudget, RetryPolicy
+from aiotx.clients._base_client import BlockMonitor
+from aiotx.exceptions import InvalidArgumentError, RpcConnectionError
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    delays = []
+
+    async def fake_sleep(delay):
+        delays.append(delay)
+
+    monkeypatch.setattr(asyncio, "sleep", fake_sleep)
+    return delays
+
+
+def failing(errors, result="ok"):
+    errors = list(errors)
+
+    async def request():
+        if errors:
+            raise errors.pop(0)
+        return result
+
+    return request
+
+
+def test_delay_is_jittered_and_capped():
+    policy = RetryPolicy(base_delay=1, max_delay=5, jitter=0.5)
+    delays = [policy.get_delay(attempt) for attempt in range(10)]
+
+    assert 0.5 <= delays[0] <= 1
+    assert all(2.5 <= delay <= 5 for delay in delays[3:])
+    assert len(set(delays)) > 1
+
+
+async def test_retryable_errors_are_retried(sleeps):
+    policy = RetryPolicy(max_retries=3)
+    request = failing([RpcConnectionError("down"), asyncio.TimeoutError()])
+
+    assert await policy.call(request) == "ok"
+    assert len(sleeps) == 2
+
+
+async def test_invalid_argument_is_not_retried(sleeps):
+    policy = RetryPolicy(max_retries=3)
+
+    with pytest.raises(InvalidArgumentError):
+        await policy.call(failing([InvalidArgumentError("bad address")]))
+    assert sleeps == []
+
+
+async def test_budget_is_shared_between_calls(sleeps):
+    policy = RetryPolicy(max_retries=5, budget=RetryBudget(ratio=0.5, capacity=2))
+    errors = [RpcConnectionError("down")] * 4
+
+    with pytest.raises(RpcConnectionError):
+        await policy.call(failing(errors))
+    with pytest.raises(RpcConnectionError):
+        await policy.call(failing(errors))
+    # Two retries of the first call took the whole budget
+    assert len(sleeps) == 2
+
+    assert await policy.call(failing([])) == "ok"
+    assert policy.budget.tokens == 0.5
+
+
+def test_monitor_retry_settings_configure_policy():
+    monitor = BlockMonitor(client=None)
+    monitor.max_retries = 3
+    monitor.retry_delay = 1
+
+    assert monitor.retry_policy.max_retries == 3
+    assert monitor.retry_policy.base_delay == 1
+
+    policy = RetryPolicy(max_retries=7)
+    monitor.retry_policy = policy
+    assert monitor.max_retries == 7
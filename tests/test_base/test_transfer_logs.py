@@ -0,0 +1,118 @@
+import asyncio
+
+import pytest
+
+from aiotx.clients import AioTxETHClient
+from aiotx.clients._evm_base_client import TRANSFER_EVENT_TOPIC
+
+CONTRACT = "0x" + "c" * 40
+RECIPIENT = "0x" + "ab" * 20
+SENDER = "0x" + "01" * 20
+RANGE_LIMIT_ERROR = {
+    "code": -32602,
+    "message": "eth_getLogs and eth_newFilter are limited to a 10,000 blocks range",
+}
+
+
+def topic(address):
+    return "0x" + address[2:].zfill(64)
+
+
+def transfer_log(block_number, log_index, value):
+    return {
+        "address": CONTRACT,
+        "topics": [TRANSFER_EVENT_TOPIC, topic(SENDER), topic(RECIPIENT)],
+        "data": hex(value),
+        "blockNumber": hex(block_number),
+        "transactionHash": f"0x{block_number:064x}",
+        "logIndex": hex(log_index),
+        "removed": False,
+    }
+
+
+LOGS = [
+    transfer_log(3, 1, 100),
+    transfer_log(3, 0, 50),
+    transfer_log(7, 2, 10),
+    # ERC-721 transfer, token id is the fourth topic
+    dict(transfer_log(8, 0, 0), topics=[TRANSFER_EVENT_TOPIC] + [topic(SENDER)] * 3),
+]
+
+
+def get_logs(log_filter):
+    from_block = int(log_filter["fromBlock"], 16)
+    to_block = int(log_filter["toBlock"], 16)
+    if to_block - from_block >= 4:
+        return RANGE_LIMIT_ERROR
+    return [
+        log for log in LOGS if from_block <= int(log["blockNumber"], 16) <= to_block
+    ]
+
+
+async def test_get_logs_splits_too_long_ranges(rpc_node):
+    rpc_node.results["eth_getLogs"] = get_logs
+    client = AioTxETHClient(rpc_node.url)
+    await client.connect()
+
+    logs = await client.get_logs(1, 10, address=CONTRACT, max_block_range=8)
+
+    assert logs == LOGS
+    ranges = [
+        (int(r["params"][0]["fromBlock"], 16), int(r["params"][0]["toBlock"], 16))
+        for r in rpc_node.requests
+    ]
+    # 1-8 is too long for the node and is split in two, 9-10 fits
+    assert ranges == [(1, 8), (1, 4), (5, 8), (9, 10)]
+    assert all(r["params"][0]["address"] == CONTRACT for r in rpc_node.requests)
+    await client.disconnect()
+
+
+async def test_monitor_reads_transfers_from_logs(rpc_node):
+    rpc_node.results["eth_blockNumber"] = hex(10)
+    rpc_node.results["eth_getLogs"] = get_logs
+    client = AioTxETHClient(rpc_node.url)
+    await client.connect()
+    client.monitor.log_block_range = 3
+    client.monitor.watch_transfers(contracts=[CONTRACT], recipients=[RECIPIENT])
+    blocks = []
+    transfers = []
+
+    @client.monitor.on_block
+    async def handle_block(block, latest_block):
+        blocks.append(block)
+        if block == 10:
+            client.stop_monitoring()
+
+    @client.monitor.on_transfer
+    async def handle_transfer(transfer):
+        transfers.append(transfer)
+
+    await asyncio.wait_for(
+        client.start_monitoring(monitoring_start_block=1, timeout_between_blocks=10),
+        5,
+    )
+
+    assert blocks == list(range(1, 11))
+    assert [(t["block_number"], t["value"]) for t in transfers] == [
+        (3, 50),
+        (3, 100),
+        (7, 10),
+    ]
+    assert transfers[0]["to"] == RECIPIENT
+    assert transfers[0]["from"] == SENDER
+    assert transfers[0]["contract"] == CONTRACT
+    log_filter = next(
+        r["params"][0] for r in rpc_node.requests if r["method"] == "eth_getLogs"
+    )
+    assert log_filter["topics"] == [TRANSFER_EVENT_TOPIC, None, [topic(RECIPIENT)]]
+    assert all(r["method"] != "eth_getBlockByNumber" for r in rpc_node.requests)
+    await client.disconnect()
+
+
+def test_watch_transfers_requires_contracts_or_recipients():
+    client = AioTxETHClient("http://localhost")
+    with pytest.raises(ValueError):
+        client.monitor.watch_transfers()
+    with pytest.raises(ValueError):
+        client.monitor.watch_transfers(contracts=[], recipients=[])
+    assert client.monitor._transfer_filter is None
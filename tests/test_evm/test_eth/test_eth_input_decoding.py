@@ -1,3 +1,5 @@
+from unittest.mock import patch
+
 import pytest
 
 
@@ -42,3 +44,21 @@ import pytest
 def test_decode_transaction_input(eth_client, input_data, expected_output):
     result = eth_client.decode_transaction_input(input_data)
     assert result == expected_output
+
+
+def test_selector_table_is_built_once(eth_client):
+    import eth_utils
+
+    with patch.object(
+        eth_utils,
+        "function_signature_to_4byte_selector",
+        wraps=eth_utils.function_signature_to_4byte_selector,
+    ) as selector:
+        eth_client.decode_transaction_input("0xa9059cbb" + "00" * 64)
+        calls = selector.call_count
+        eth_client.decode_transaction_input("0x095ea7b3" + "00" * 64)
+        eth_client.decode_transaction_input("0x12345678")
+
+    assert calls > 0
+    assert selector.call_count == calls
+    assert "a9059cbb" in eth_client._get_selector_decoders()
@@ -0,0 +1,41 @@
+import pytest
+from conftest import UTXO_ADDRESS, get_utxo_block, utxo_output
+
+from aiotx.utils.bloom_filter import BloomFilter
+
+
+@pytest.mark.parametrize(
+    "utxo_client",
+    [{"bloom_filter_error_rate": None}, {"bloom_filter_error_rate": 0.01}],
+    indirect=True,
+)
+async def test_blocks_are_matched_with_in_memory_index(utxo_client):
+    await utxo_client.connect()
+    await utxo_client.import_address(UTXO_ADDRESS, block_number=11)
+    monitor = utxo_client.monitor
+
+    await monitor.process_block(11, get_utxo_block("11", 2))
+    assert await utxo_client.get_balance(UTXO_ADDRESS) == 100_000_000
+    # Addresses imported after the index was loaded are matched too
+    await utxo_client.import_address("tb1qlate", block_number=13)
+    late_block = {
+        "tx": [{"txid": "d" * 64, "vin": [], "vout": [utxo_output("tb1qlate", 2)]}]
+    }
+    await monitor.process_block(13, late_block)
+    assert await utxo_client.get_balance("tb1qlate") == 200_000_000
+
+    await monitor.process_block(12, get_utxo_block("12", 2))
+    assert await utxo_client.get_balance(UTXO_ADDRESS) == 0
+
+
+def test_bloom_filter():
+    bloom_filter = BloomFilter(capacity=1000, error_rate=0.01)
+    for i in range(1000):
+        bloom_filter.add(f"address{i}")
+
+    assert all(f"address{i}" in bloom_filter for i in range(1000))
+    false_positives = sum(f"other{i}" in bloom_filter for i in range(10000))
+    assert false_positives < 300
+    assert not bloom_filter.is_full
+    bloom_filter.add("one more")
+    assert bloom_filter.is_full
@@ -0,0 +1,24 @@
+import asyncio
+
+from conftest import UTXO_ADDRESS
+
+
+async def test_backfill_applies_blocks_in_order(utxo_client, utxo_node):
+    utxo_node.delay = 0.01
+    await utxo_client.connect()
+    await utxo_client.import_address(UTXO_ADDRESS, block_number=11)
+    progress_reports = []
+
+    @utxo_client.monitor.on_backfill_progress
+    async def handle_progress(progress):
+        progress_reports.append(progress)
+        if progress.current_block == 20:
+            utxo_client.stop_monitoring()
+
+    await asyncio.wait_for(utxo_client.start_monitoring(prefetch_window=5), 5)
+
+    assert await utxo_client.get_balance(UTXO_ADDRESS) == 50_000_000
+    assert utxo_node.max_in_flight > 1
+    assert progress_reports[-1].current_block == 20
+    assert progress_reports[-1].processed_blocks == 10
+    assert progress_reports[-1].blocks_per_second > 0
@@ -0,0 +1,24 @@
+from conftest import UTXO_ADDRESS, get_utxo_block
+
+
+async def test_balances_are_summed_by_the_database(utxo_client):
+    utxo_client.monitor.balance_query_chunk_size = 1
+    await utxo_client.import_address(UTXO_ADDRESS, block_number=11)
+    await utxo_client.import_address("tb1qempty", block_number=11)
+    await utxo_client.monitor.process_block(11, get_utxo_block("11", 2))
+    await utxo_client.monitor.process_block(13, get_utxo_block("13", 2))
+    await utxo_client.monitor._add_new_utxo("tb1qother", "e" * 64, 700, 0)
+
+    assert await utxo_client.get_balance(UTXO_ADDRESS) == 150_000_000
+    assert await utxo_client.get_balance("tb1qunknown") == 0
+    assert await utxo_client.get_balances() == {
+        UTXO_ADDRESS: 150_000_000,
+        "tb1qempty": 0,
+    }
+    assert await utxo_client.get_balances(
+        [UTXO_ADDRESS, "tb1qother", "tb1qunknown"]
+    ) == {
+        UTXO_ADDRESS: 150_000_000,
+        "tb1qother": 700,
+        "tb1qunknown": 0,
+    }
@@ -0,0 +1,74 @@
+from unittest.mock import patch
+
+import pytest
+from conftest import (
+    FUNDING_TX,
+    SECOND_FUNDING_TX,
+    SPENDING_TX,
+    UTXO_ADDRESS,
+    utxo_output,
+)
+
+
+async def test_block_is_applied_in_one_transaction(utxo_client):
+    await utxo_client.import_address(UTXO_ADDRESS, block_number=11)
+    monitor = utxo_client.monitor
+    # Output created and spent in the same block is never left unspent
+    block = {
+        "tx": [
+            {"txid": FUNDING_TX, "vin": [], "vout": [utxo_output(UTXO_ADDRESS, 1.0)]},
+            {
+                "txid": SPENDING_TX,
+                "vin": [{"txid": FUNDING_TX, "vout": 0}],
+                "vout": [utxo_output(UTXO_ADDRESS, 0.25, n=1)],
+            },
+        ]
+    }
+    await monitor.process_block(11, block)
+    assert await utxo_client.get_balance(UTXO_ADDRESS) == 25_000_000
+    assert await monitor._get_last_block() == 12
+
+    # Processing the block again doesn't fail on known UTXOs
+    await monitor.process_block(11, block)
+    assert await utxo_client.get_balance(UTXO_ADDRESS) == 25_000_000
+    assert await monitor._get_last_block() == 12
+
+    # Failed delete rolls back new UTXOs, the block is not processed
+    block = {
+        "tx": [
+            {
+                "txid": SECOND_FUNDING_TX,
+                "vin": [{"txid": SPENDING_TX, "vout": 1}],
+                "vout": [utxo_output(UTXO_ADDRESS, 0.5)],
+            }
+        ]
+    }
+    with patch("sqlalchemy.delete", side_effect=RuntimeError):
+        with pytest.raises(RuntimeError):
+            await monitor.process_block(12, block)
+    assert await utxo_client.get_balance(UTXO_ADDRESS) == 25_000_000
+    assert await monitor._get_last_block() == 12
+
+
+async def test_block_is_processed_again_after_handler_error(utxo_client):
+    await utxo_client.import_address(UTXO_ADDRESS, block_number=11)
+    monitor = utxo_client.monitor
+    deposits = []
+    fail = True
+
+    @monitor.on_new_utxo_transaction
+    async def handle_deposit(transaction):
+        if fail:
+            raise RuntimeError("handler failed")
+        deposits.append(transaction["txid"])
+
+    with pytest.raises(RuntimeError):
+        await monitor.poll_blocks(0)
+    assert await monitor._get_last_block() == 11
+
+    # The deposit is delivered again when the block is processed again
+    fail = False
+    await monitor.poll_blocks(0)
+    assert deposits == [FUNDING_TX]
+    assert await monitor._get_last_block() == 12
+    assert await utxo_client.get_balance(UTXO_ADDRESS) == 100_000_000
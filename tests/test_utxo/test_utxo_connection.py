@@ -0,0 +1,58 @@
+import asyncio
+
+import aiohttp
+import pytest
+
+
+@pytest.mark.parametrize(
+    "utxo_client",
+    [{"node_username": "user", "node_password": "secret"}],
+    indirect=True,
+)
+async def test_utxo_client_reuses_one_session(utxo_client, utxo_node):
+    await utxo_client.connect()
+    session = utxo_client._session
+    connector = session.connector
+
+    assert await utxo_client.get_last_block_number() == 20
+    assert await utxo_client.get_block_hash(5) == "5"
+    await asyncio.gather(*[utxo_client.get_block_hash(n) for n in range(3)])
+
+    assert utxo_client._session is session
+    assert session.connector is connector
+    auth = aiohttp.BasicAuth("user", "secret").encode()
+    assert len(utxo_node.request_headers) >= 5
+    assert all(h["Authorization"] == auth for h in utxo_node.request_headers)
+
+    await utxo_client.disconnect()
+    assert session.closed
+    assert utxo_client._session is None
+
+
+async def test_utxo_client_monitors_without_connect(utxo_client):
+    blocks = []
+
+    @utxo_client.monitor.on_block
+    async def handle_block(block):
+        blocks.append(block)
+        utxo_client.stop_monitoring()
+
+    await asyncio.wait_for(utxo_client.start_monitoring(timeout_between_blocks=0), 5)
+
+    assert blocks == [20]
+
+
+async def test_utxo_monitor_creates_tables_after_implicit_session(utxo_client):
+    blocks = []
+
+    @utxo_client.monitor.on_block
+    async def handle_block(block):
+        blocks.append(block)
+        utxo_client.stop_monitoring()
+
+    # The RPC call opens the session without creating the tables
+    assert await utxo_client.get_last_block_number() == 20
+    await asyncio.wait_for(utxo_client.start_monitoring(timeout_between_blocks=0), 5)
+
+    assert blocks == [20]
+    assert await utxo_client.monitor._get_last_block() == 20
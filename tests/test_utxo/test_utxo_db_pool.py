@@ -0,0 +1,33 @@
+import pytest
+from conftest import UTXO_ADDRESS, get_utxo_block
+
+
+@pytest.mark.parametrize(
+    "utxo_client", [{"db_pool_size": 2, "db_pool_recycle": 60}], indirect=True
+)
+async def test_database_connections_are_pooled(utxo_client):
+    pool = utxo_client.monitor._engine.pool
+    assert pool.size() == 2
+    assert pool._recycle == 60
+
+    await utxo_client.import_address(UTXO_ADDRESS, block_number=11)
+    opened = pool.checkedin()
+    await utxo_client.get_balance(UTXO_ADDRESS)
+    await utxo_client.get_balance(UTXO_ADDRESS)
+    # Queries reuse connections opened before
+    assert pool.checkedin() == opened
+    await utxo_client.disconnect()
+    assert utxo_client.monitor._engine.pool.checkedin() == 0
+
+
+@pytest.mark.parametrize(
+    "utxo_client", [{"db_url": "sqlite+aiosqlite:///:memory:"}], indirect=True
+)
+async def test_in_memory_database_survives_disconnect(utxo_client):
+    await utxo_client.connect()
+    await utxo_client.import_address(UTXO_ADDRESS, block_number=11)
+    await utxo_client.monitor.process_block(11, get_utxo_block("11", 2))
+    await utxo_client.disconnect()
+
+    await utxo_client.connect()
+    assert await utxo_client.get_balance(UTXO_ADDRESS) == 100_000_000
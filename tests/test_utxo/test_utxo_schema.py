@@ -0,0 +1,31 @@
+import asyncio
+import sqlite3
+
+
+async def test_missing_indexes_are_created(utxo_client, utxo_node, tmp_path):
+    db_path = tmp_path / "utxo.sqlite"
+    # Table created by an older version, without indexes
+    with sqlite3.connect(db_path) as connection:
+        connection.execute(
+            "CREATE TABLE testnet_utxo (tx_id VARCHAR(255), output_n INTEGER, "
+            "address VARCHAR(255), amount_satoshi BIGINT, used BOOLEAN, "
+            "PRIMARY KEY (tx_id, output_n))"
+        )
+
+    # Client is created inside the running loop without touching the node
+    assert utxo_node.requests == []
+    await asyncio.gather(utxo_client.connect(), utxo_client.init(), utxo_client.init())
+    assert [request["method"] for request in utxo_node.requests] == ["getblockcount"]
+    assert await utxo_client.monitor._get_last_block() == 20
+    await utxo_client.disconnect()
+
+    with sqlite3.connect(db_path) as connection:
+        indexes = {
+            row[1] for row in connection.execute("PRAGMA index_list(testnet_utxo)")
+        }
+        plan = connection.execute(
+            "EXPLAIN QUERY PLAN SELECT SUM(amount_satoshi) FROM testnet_utxo "
+            "WHERE address = 'a' AND used = 0"
+        ).fetchall()
+    assert "ix_testnet_utxo_address_used_amount" in indexes
+    assert "COVERING INDEX ix_testnet_utxo_address_used_amount" in str(plan)